@@ -2,37 +2,197 @@ from flask import Flask, jsonify
 from flask_cors import CORS
 from typing import Optional
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from config import get_config, Config
 
 from core.container import container
+from core.cache import LRUCache
+from core.single_flight import SingleFlight
+from core.json_provider import setup_json_provider
+from core.logging_config import configure_logging
+from core.metrics import MetricsRegistry, QueryMetricsListener
+from services.connection_pool import ConnectionPool
 from services.database_service import DatabaseService
+from services.storage_profile import StorageProfile
 from services.book_service import BookService
+from services.search_index_service import SearchIndexService
+from services.count_cache import CountCache
+from services.subject_catalog import SubjectCatalog
+from services.schema_service import SchemaService, QueryPlanGuard
+from services.catalog_version import CatalogVersion
+from services.query_profiler import QueryProfiler
 
 from middleware.logging_middleware import setup_request_logging
+from middleware.conditional_middleware import setup_conditional_requests
+from middleware.compression_middleware import ResponseCompressor, setup_compression
+from middleware.metrics_middleware import setup_metrics, define_metrics, collect_service_metrics
+from middleware.profiling_middleware import setup_profiling
 
 from routes.health import health_bp
 from routes.books import books_bp
 from routes.authors import authors_bp
+from routes.metrics import metrics_bp
 
-
-def configure_logging(config: Config) -> None:
-    logging.basicConfig(
-        level=getattr(logging, config.LOG_LEVEL),
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
+from commands.search_index import search_index_cli
+from commands.schema import schema_cli
+from commands.subjects import subjects_cli
+from commands.catalog_version import catalog_version_cli
 
 
 def register_services(config: Config) -> None:
     logger = logging.getLogger(__name__)
     
+    storage_profile = StorageProfile.from_config(config)
+    
+    def create_connection_pool():
+        return ConnectionPool(
+            db_path=config.DATABASE_PATH,
+            max_size=config.DB_POOL_SIZE,
+            timeout=config.DB_POOL_TIMEOUT,
+            idle_timeout=config.DB_POOL_IDLE_TIMEOUT,
+            validate=config.DB_POOL_VALIDATE,
+            profile=storage_profile,
+            read_only=True
+        )
+    
+    def create_writer_connection_pool():
+        return ConnectionPool(
+            db_path=config.DATABASE_PATH,
+            max_size=1,
+            timeout=config.DB_WRITE_TIMEOUT,
+            idle_timeout=config.DB_POOL_IDLE_TIMEOUT,
+            validate=config.DB_POOL_VALIDATE,
+            profile=storage_profile
+        )
+    
+    def create_metrics_registry():
+        registry = MetricsRegistry(
+            snapshot_dir=config.METRICS_DIR,
+            flush_interval=config.METRICS_FLUSH_INTERVAL
+        )
+        define_metrics(registry)
+        registry.add_collector(collect_service_metrics)
+        return registry
+    
     def create_db_service():
-        return DatabaseService(db_path=config.DATABASE_PATH)
+        db_service = DatabaseService(
+            db_path=config.DATABASE_PATH,
+            pool=container.get('writer_connection_pool'),
+            read_pool=container.get('connection_pool'),
+            iter_chunk_size=config.DB_ITER_CHUNK_SIZE
+        )
+        if config.METRICS_ENABLED:
+            db_service.add_query_listener(QueryMetricsListener(
+                container.get('metrics_registry'),
+                max_shapes=config.METRICS_MAX_QUERY_SHAPES
+            ))
+        return db_service
+    
+    def create_search_index_service():
+        db_service = container.get('database_service')
+        return SearchIndexService(db_service=db_service)
+    
+    def create_subject_catalog():
+        return SubjectCatalog(db_service=container.get('database_service'))
+    
+    def create_schema_service():
+        return SchemaService(db_service=container.get('database_service'))
+    
+    def create_query_plan_guard():
+        return QueryPlanGuard(
+            db_service=container.get('database_service'),
+            mode=config.QUERY_PLAN_GUARD
+        )
+    
+    def create_count_cache():
+        return CountCache(
+            max_entries=config.COUNT_CACHE_SIZE,
+            ttl=config.COUNT_CACHE_TTL,
+            version_source=container.get('catalog_version').version
+        )
+    
+    def create_response_cache():
+        if not config.RESPONSE_CACHE_ENABLED:
+            return None
+        catalog_version = container.get('catalog_version')
+        return LRUCache(
+            max_entries=config.RESPONSE_CACHE_SIZE,
+            ttl=config.RESPONSE_CACHE_TTL,
+            version_source=catalog_version.version
+        )
+    
+    def create_single_flight():
+        if not config.SINGLE_FLIGHT_ENABLED:
+            return None
+        return SingleFlight(
+            timeout=config.SINGLE_FLIGHT_TIMEOUT,
+            version_source=container.get('catalog_version').version
+        )
+    
+    def create_response_compressor():
+        cache = None
+        if config.COMPRESSION_CACHE_SIZE > 0:
+            cache = LRUCache(max_entries=config.COMPRESSION_CACHE_SIZE, ttl=config.COMPRESSION_CACHE_TTL)
+        return ResponseCompressor(
+            min_size=config.COMPRESSION_MIN_SIZE,
+            level=config.COMPRESSION_LEVEL,
+            cache=cache
+        )
+    
+    def create_query_profiler():
+        db_service = container.get('database_service')
+        profiler = QueryProfiler(
+            db_service=db_service,
+            mode=config.PROFILER_MODE,
+            header=config.PROFILER_HEADER,
+            slow_query_ms=config.SLOW_QUERY_MS,
+            explain=config.PROFILER_EXPLAIN,
+            max_traces=config.PROFILER_MAX_TRACES
+        )
+        db_service.add_query_listener(profiler)
+        return profiler
+    
+    def create_catalog_version():
+        return CatalogVersion(db_service=container.get('database_service'), ttl=config.CATALOG_VERSION_TTL)
     
     def create_book_service():
         db_service = container.get('database_service')
-        return BookService(db_service=db_service)
+        search_index = container.get('search_index_service')
+        return BookService(
+            db_service=db_service,
+            search_index=search_index,
+            count_cache=container.get('count_cache'),
+            count_estimate_cap=config.COUNT_ESTIMATE_CAP,
+            query_plan_guard=container.get('query_plan_guard'),
+            response_cache=container.get('response_cache'),
+            subject_catalog=container.get('subject_catalog'),
+            catalog_version=container.get('catalog_version'),
+            list_query_mode=config.LIST_QUERY_MODE,
+            query_executor=container.get('query_executor'),
+            list_query_timeout=config.LIST_QUERY_TIMEOUT,
+            single_flight=container.get('single_flight')
+        )
     
+    def create_query_executor():
+        # Kept apart from the request threads (a2wsgi's pool under ASGI): a
+        # request waiting on its count must never queue that count behind itself.
+        return ThreadPoolExecutor(max_workers=config.QUERY_EXECUTOR_WORKERS, thread_name_prefix='books-query')
+    
+    container.register_singleton('metrics_registry', create_metrics_registry)
+    container.register_singleton('connection_pool', create_connection_pool)
+    container.register_singleton('writer_connection_pool', create_writer_connection_pool)
     container.register_singleton('database_service', create_db_service)
+    container.register_singleton('search_index_service', create_search_index_service)
+    container.register_singleton('subject_catalog', create_subject_catalog)
+    container.register_singleton('schema_service', create_schema_service)
+    container.register_singleton('query_plan_guard', create_query_plan_guard)
+    container.register_singleton('count_cache', create_count_cache)
+    container.register_singleton('catalog_version', create_catalog_version)
+    container.register_singleton('response_compressor', create_response_compressor)
+    container.register_singleton('query_profiler', create_query_profiler)
+    container.register_singleton('response_cache', create_response_cache)
+    container.register_singleton('query_executor', create_query_executor)
+    container.register_singleton('single_flight', create_single_flight)
     container.register_singleton('book_service', create_book_service)
     
     logger.info("Services registered successfully")
@@ -40,10 +200,18 @@ def register_services(config: Config) -> None:
 
 def register_blueprints(app: Flask) -> None:
     app.register_blueprint(health_bp)
+    app.register_blueprint(metrics_bp)
     app.register_blueprint(books_bp, url_prefix='/api/v1')
     app.register_blueprint(authors_bp, url_prefix='/api/v1')
 
 
+def register_commands(app: Flask) -> None:
+    app.cli.add_command(search_index_cli)
+    app.cli.add_command(schema_cli)
+    app.cli.add_command(subjects_cli)
+    app.cli.add_command(catalog_version_cli)
+
+
 def register_error_handlers(app: Flask) -> None:
     logger = logging.getLogger(__name__)
     
@@ -57,7 +225,7 @@ def register_error_handlers(app: Flask) -> None:
     
     @app.errorhandler(ValueError)
     def handle_value_error(error):
-        logger.warning(f"Validation error: {error}")
+        logger.warning("Validation error: %s", error)
         return jsonify({
             'error': 'Validation error',
             'message': str(error)
@@ -106,14 +274,28 @@ def create_app(config_name: Optional[str] = None) -> Flask:
     app = Flask(__name__)
     app.config.from_object(config)
     
+    setup_json_provider(app)
+    
     CORS(app, origins=config.CORS_ORIGINS)
     
+    # after_request handlers run in reverse order, so compression is
+    # registered first to see the final body and ETag.
+    setup_compression(app)
+    
     setup_request_logging(app)
     
+    setup_metrics(app)
+    
+    setup_profiling(app)
+    
+    setup_conditional_requests(app)
+    
     register_services(config)
     
     register_blueprints(app)
     
+    register_commands(app)
+    
     register_error_handlers(app)
     
     verify_services()
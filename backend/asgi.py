@@ -0,0 +1,52 @@
+import logging
+
+from a2wsgi import WSGIMiddleware
+
+from app import app as flask_app
+from config import get_config
+from core.container import container
+
+logger = logging.getLogger(__name__)
+
+# a2wsgi runs each request through the unchanged WSGI app on its own thread
+# pool, so hooks, caches and streaming behave exactly as under gunicorn's
+# sync workers while the event loop multiplexes slow clients. sqlite3 has
+# no async driver, so there is nothing to gain from coroutine views.
+# This is not an async read path: each request, reads included, holds one
+# of the ASYNC_WORKERS threads for its whole database round-trip.
+wsgi = WSGIMiddleware(flask_app, workers=get_config().ASYNC_WORKERS)
+
+
+def shutdown() -> None:
+    wsgi.executor.shutdown(wait=True)
+
+    query_executor = container.get_existing('query_executor')
+    if query_executor is not None:
+        query_executor.shutdown(wait=True)
+
+    registry = container.get_existing('metrics_registry')
+    if registry is not None:
+        registry.stop_flusher()
+        registry.flush(force=True)
+
+    db_service = container.get_existing('database_service')
+    if db_service is not None:
+        db_service.close()
+    logger.info("ASGI app shut down")
+
+
+async def app(scope, receive, send) -> None:
+    # a2wsgi acknowledges lifespan events without acting on them; a
+    # standalone uvicorn has no worker_exit hook, so shutdown happens here.
+    if scope['type'] != 'lifespan':
+        await wsgi(scope, receive, send)
+        return
+
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            shutdown()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
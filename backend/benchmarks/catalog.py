@@ -0,0 +1,176 @@
+import argparse
+import os
+import random
+import sqlite3
+import time
+from itertools import accumulate
+from typing import Iterator, List, Tuple
+
+SIZES = {'10k': 10_000, '100k': 100_000, '1m': 1_000_000}
+
+WORDS = (
+    "time year people way day man thing woman life child world school state family student group "
+    "country problem hand part place case week company system program question work government number "
+    "night point home water room mother area money story fact month lot right study book eye job word "
+    "business issue side kind head house service friend father power hour game line end member law car "
+    "city community name president team minute idea kid body information back parent face others level "
+    "office door health person art war history party result change morning reason research girl guy "
+    "moment air teacher force education river garden letter silence shadow empire journey secret island "
+    "winter summer storm light darkness memory dream machine language music ocean mountain forest glass"
+).split()
+
+SUBJECTS = [
+    'Fiction', 'History', 'Biography', 'Science', 'Mystery', 'Romance', 'Fantasy', 'Science Fiction',
+    'Poetry', 'Drama', 'Philosophy', 'Religion', 'Psychology', 'Business', 'Economics', 'Politics',
+    'Travel', 'Cooking', 'Art', 'Music', 'Photography', 'Education', 'Children', 'Young Adult',
+    'Programming', 'Computers', 'Mathematics', 'Physics', 'Chemistry', 'Biology', 'Medicine', 'Health',
+    'Sports', 'Humor', 'Comics', 'Horror', 'Thriller', 'Crime', 'Law', 'Architecture', 'Design',
+    'Gardening', 'Nature', 'Animals', 'Self-Help', 'Parenting', 'Reference', 'Languages', 'Essays',
+    'Classics', 'Military', 'Westerns', 'Adventure', 'Short Stories', 'Anthropology', 'Sociology',
+    'Astronomy', 'Engineering', 'Technology', 'Film'
+]
+
+FORMATS = [('Paperback', 55), ('Hardcover', 30), ('Digital', 10), ('Audio', 5)]
+
+# Column affinities follow db.sqlite so the planner sees the same schema.
+BOOK_COLUMNS = [
+    ('id', 'INTEGER'), ('title', 'TEXT'), ('author', 'TEXT'), ('author_id', 'INTEGER'),
+    ('author_bio', 'TEXT'), ('authors', 'TEXT'), ('title_slug', 'TEXT'), ('author_slug', 'TEXT'),
+    ('isbn13', 'INTEGER'), ('isbn10', 'TEXT'), ('price', 'TEXT'), ('format', 'TEXT'),
+    ('publisher', 'TEXT'), ('pubdate', 'TEXT'), ('edition', 'TEXT'), ('subjects', 'TEXT'),
+    ('lexile', 'TEXT'), ('pages', 'REAL'), ('dimensions', 'TEXT'), ('overview', 'TEXT'),
+    ('excerpt', 'TEXT'), ('synopsis', 'TEXT'), ('toc', 'TEXT'), ('editorial_reviews', 'TEXT')
+]
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS author (id INTEGER, title TEXT, slug TEXT, biography TEXT);
+CREATE TABLE IF NOT EXISTS book ({', '.join(f'{name} {kind}' for name, kind in BOOK_COLUMNS)});
+"""
+
+
+def zipf_weights(count: int, exponent: float = 1.1) -> List[float]:
+    # Cumulative, so random.choices can bisect instead of summing per draw.
+    return list(accumulate(1 / (rank ** exponent) for rank in range(1, count + 1)))
+
+
+def slugify(text: str) -> str:
+    return '-'.join(text.lower().split())
+
+
+class CatalogGenerator:
+    def __init__(self, books: int, authors: int = None, publishers: int = 200, seed: int = 42):
+        self.books = books
+        self.authors = authors or max(books // 20, 10)
+        self.publishers = [
+            f"{WORDS[i % len(WORDS)].title()} {('Press', 'Books', 'House')[i % 3]}" for i in range(publishers)
+        ]
+        self.rng = random.Random(seed)
+        self.subject_weights = zipf_weights(len(SUBJECTS))
+        self.publisher_weights = zipf_weights(len(self.publishers))
+        self.author_weights = zipf_weights(self.authors, exponent=0.8)
+
+    def text(self, min_chars: int, max_chars: int) -> str:
+        # Vocabulary words average about six characters with the separator.
+        count = self.rng.randint(min_chars, max_chars) // 6 + 1
+        return ' '.join(self.rng.choices(WORDS, k=count)).capitalize() + '.'
+
+    def iter_authors(self) -> Iterator[Tuple]:
+        for author_id in range(1, self.authors + 1):
+            name = f"{self.rng.choice(WORDS).title()} {self.rng.choice(WORDS).title()} {author_id}"
+            yield author_id, name, slugify(name), self.text(100, 400)
+
+    def iter_books(self, author_names: List[str]) -> Iterator[Tuple]:
+        formats, format_weights = zip(*FORMATS)
+        format_weights = list(accumulate(format_weights))
+        author_ids = range(1, self.authors + 1)
+
+        for book_id in range(1, self.books + 1):
+            rng = self.rng
+            author_id = rng.choices(author_ids, cum_weights=self.author_weights)[0]
+            author = author_names[author_id - 1]
+            title = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(2, 6))).title()
+            subjects = []
+            for subject in rng.choices(SUBJECTS, cum_weights=self.subject_weights, k=rng.randint(1, 4)):
+                if subject not in subjects:
+                    subjects.append(subject)
+
+            yield (
+                book_id, title, author, author_id, self.text(100, 400), author,
+                slugify(f"{title} {book_id}"), slugify(author),
+                9780000000000 + book_id, f"{book_id:010d}", f"${rng.randint(5, 120)}.{rng.randint(0, 99):02d}",
+                rng.choices(formats, cum_weights=format_weights)[0],
+                rng.choices(self.publishers, cum_weights=self.publisher_weights)[0],
+                f"{rng.randint(1950, 2024)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+                str(rng.randint(1, 5)), ', '.join(subjects), f"{rng.randint(200, 1400)}L",
+                float(rng.randint(48, 1200)), f"{rng.randint(5, 9)} x {rng.randint(7, 11)} in",
+                self.text(300, 1500), self.text(500, 2000), self.text(200, 1000),
+                self.text(100, 400), self.text(200, 1000)
+            )
+
+    def write(self, path: str, batch_size: int = 5000) -> None:
+        conn = sqlite3.connect(path)
+        conn.executescript(SCHEMA)
+
+        authors = list(self.iter_authors())
+        conn.executemany("INSERT INTO author VALUES (?, ?, ?, ?)", authors)
+
+        placeholders = ', '.join('?' for _ in BOOK_COLUMNS)
+        batch = []
+        for row in self.iter_books([author[1] for author in authors]):
+            batch.append(row)
+            if len(batch) >= batch_size:
+                conn.executemany(f"INSERT INTO book VALUES ({placeholders})", batch)
+                batch = []
+        if batch:
+            conn.executemany(f"INSERT INTO book VALUES ({placeholders})", batch)
+
+        conn.commit()
+        conn.close()
+
+
+def prepare_catalog(path: str) -> None:
+    from services.database_service import DatabaseService
+    from services.search_index_service import SearchIndexService
+    from services.subject_catalog import SubjectCatalog
+    from services.schema_service import SchemaService
+    from services.catalog_version import CatalogVersion
+
+    db_service = DatabaseService(db_path=path)
+    search_index = SearchIndexService(db_service)
+    search_index.create()
+    search_index.rebuild()
+    catalog = SubjectCatalog(db_service)
+    catalog.create()
+    catalog.rebuild()
+    CatalogVersion(db_service).create()
+    SchemaService(db_service).ensure_indexes()
+    db_service.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Generate a synthetic book catalog')
+    parser.add_argument('--size', default='10k', help=f"{', '.join(SIZES)} or a number of books")
+    parser.add_argument('--output', required=True)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--raw', action='store_true', help='Skip FTS, subject catalog and indexes')
+    parser.add_argument('--force', action='store_true', help='Overwrite an existing file')
+    args = parser.parse_args()
+
+    books = SIZES.get(args.size.lower()) or int(args.size)
+    if os.path.exists(args.output):
+        if not args.force:
+            raise SystemExit(f"{args.output} exists, pass --force to overwrite")
+        os.remove(args.output)
+
+    started = time.perf_counter()
+    CatalogGenerator(books, seed=args.seed).write(args.output)
+    print(f"Generated {books} books in {time.perf_counter() - started:.1f}s")
+
+    if not args.raw:
+        started = time.perf_counter()
+        prepare_catalog(args.output)
+        print(f"Built search index, subject catalog and indexes in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
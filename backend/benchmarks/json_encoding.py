@@ -0,0 +1,73 @@
+import argparse
+import json
+import time
+from typing import Any, Callable, Dict
+
+from flask.json.provider import DefaultJSONProvider
+
+from app import app
+from core.json_provider import FastJSONProvider
+
+
+def measure(name: str, encode: Callable[[], Any], iterations: int) -> Dict[str, Any]:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        encode()
+    elapsed = time.perf_counter() - started
+
+    return {
+        'name': name,
+        'iterations': iterations,
+        'mean_ms': round(elapsed / iterations * 1000, 3),
+        'per_second': round(iterations / elapsed)
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Compare JSON providers on /api/v1/books responses')
+    parser.add_argument('--page-size', type=int, default=100)
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--compact', choices=['true', 'false'], default='true')
+    args = parser.parse_args()
+
+    url = f'/api/v1/books?page_size={args.page_size}'
+    client = app.test_client()
+    payload = client.get(url).get_json()
+
+    providers = {
+        'stdlib': DefaultJSONProvider(app),
+        'fast': FastJSONProvider(app, encoder='auto')
+    }
+    for provider in providers.values():
+        provider.compact = args.compact == 'true'
+
+    results = []
+    with app.app_context():
+        reference = providers['stdlib'].response(payload).data
+        if providers['fast'].response(payload).data != reference:
+            raise SystemExit("JSON providers disagree on the response body")
+
+        for name, provider in providers.items():
+            results.append(measure(
+                f'encode_{name}', lambda: provider.response(payload), args.iterations
+            ))
+
+    # End to end through the test client; BookService's response cache keeps
+    # the database out of the measurement once warm.
+    original = app.json
+    for name, provider in providers.items():
+        app.json = provider
+        client.get(url)
+        results.append(measure(f'request_{name}', lambda: client.get(url), args.iterations))
+    app.json = original
+
+    print(json.dumps({
+        'url': url,
+        'response_bytes': len(reference),
+        'encoder': providers['fast'].encoder,
+        'results': results
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
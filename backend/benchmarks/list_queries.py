@@ -0,0 +1,71 @@
+import argparse
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+from benchmarks.stats import summarize
+from services.book_service import BookService
+from services.connection_pool import ConnectionPool
+from services.database_service import DatabaseService
+from services.storage_profile import StorageProfile
+
+CASES = {
+    'unfiltered': {},
+    'format': {'filters': {'format': 'Hardcover'}},
+    'title_like': {'filters': {'title': 'river'}, 'order_by': 'title'},
+    'full_text': {'filters': {'q': 'river storm'}, 'order_by': 'relevance'},
+    'subjects_all': {'filters': {'subjects': {'values': ['Fiction', 'History'], 'mode': 'all'}}},
+    'deep_page': {'filters': {'format': 'Paperback'}, 'page': 200},
+}
+
+
+def build_service(db_path: str, mode: str, executor: ThreadPoolExecutor) -> BookService:
+    profile = StorageProfile()
+    db_service = DatabaseService(
+        db_path=db_path,
+        pool=ConnectionPool(db_path, max_size=1, profile=profile),
+        read_pool=ConnectionPool(db_path, max_size=4, profile=profile, read_only=True)
+    )
+    return BookService(db_service=db_service, list_query_mode=mode, query_executor=executor)
+
+
+def run_case(service: BookService, case: Dict[str, Any], iterations: int) -> Dict[str, Any]:
+    latencies: List[float] = []
+    started = time.perf_counter()
+    for _ in range(iterations):
+        # Every call has to count; otherwise the cached total hides the mode.
+        service.count_cache.invalidate()
+        call_started = time.perf_counter()
+        service.get_books_with_filters(page_size=20, **case)
+        latencies.append(time.perf_counter() - call_started)
+    return summarize(latencies, 0, time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Compare LIST_QUERY_MODE strategies for book listings')
+    parser.add_argument('--db', required=True, help='Catalog generated by benchmarks.catalog')
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--modes', default=','.join(BookService.LIST_QUERY_MODES))
+    args = parser.parse_args()
+
+    executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='bench-query')
+    results: Dict[str, Dict[str, Any]] = {}
+    for mode in args.modes.split(','):
+        service = build_service(args.db, mode, executor)
+        service.get_books_with_filters()
+        results[mode] = {name: run_case(service, case, args.iterations) for name, case in CASES.items()}
+        service.db_service.close()
+    executor.shutdown()
+
+    print(json.dumps({
+        'iterations': args.iterations,
+        'p50_ms': {
+            name: {mode: results[mode][name]['p50_ms'] for mode in results} for name in CASES
+        },
+        'results': results
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+import argparse
+import json
+import sqlite3
+import time
+from typing import Any, Callable, Dict, List
+
+from models.book import Book, get_book_row_mapper
+
+BOOK_COLUMNS = [
+    'id', 'title', 'author', 'author_id', 'author_bio', 'authors', 'title_slug',
+    'author_slug', 'isbn13', 'isbn10', 'price', 'format', 'publisher', 'pubdate',
+    'edition', 'subjects', 'lexile', 'pages', 'dimensions', 'overview', 'excerpt',
+    'synopsis', 'toc', 'editorial_reviews'
+]
+
+
+def create_fixture(rows: int) -> sqlite3.Connection:
+    conn = sqlite3.connect(':memory:')
+    conn.row_factory = sqlite3.Row
+    conn.execute(f"CREATE TABLE book ({', '.join(BOOK_COLUMNS)})")
+    conn.executemany(
+        f"INSERT INTO book VALUES ({', '.join('?' for _ in BOOK_COLUMNS)})",
+        (
+            (
+                i, f"Book {i}", f"Author {i % 500}", i % 500, "Bio", "Author", f"book-{i}",
+                f"author-{i % 500}", 9780000000000 + i, str(i), "$10", "Paperback", "Publisher",
+                "2020-01-01", "1", "Fiction, Drama", "", 320.0, "", "Overview", "Excerpt",
+                "Synopsis", "", ""
+            )
+            for i in range(1, rows + 1)
+        )
+    )
+    return conn
+
+
+def dataclass_round_trip(rows: List[sqlite3.Row]) -> List[Dict[str, Any]]:
+    return [Book.from_db_row(row).to_dict() for row in rows]
+
+
+def row_mapper(rows: List[sqlite3.Row]) -> List[Dict[str, Any]]:
+    mapper = get_book_row_mapper(tuple(rows[0].keys()))
+    return [mapper.to_dict(row) for row in rows]
+
+
+def measure(name: str, serialize: Callable, rows: List[sqlite3.Row], repeat: int) -> Dict[str, Any]:
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        serialize(rows)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+
+    return {
+        'name': name,
+        'rows': len(rows),
+        'best_seconds': round(best, 4),
+        'rows_per_second': round(len(rows) / best)
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Compare Book row serialization paths')
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    conn = create_fixture(args.rows)
+    rows = conn.execute("SELECT * FROM book").fetchall()
+
+    if dataclass_round_trip(rows[:10]) != row_mapper(rows[:10]):
+        raise SystemExit("Serialization paths disagree")
+
+    results = [
+        measure('dataclass_round_trip', dataclass_round_trip, rows, args.repeat),
+        measure('row_mapper', row_mapper, rows, args.repeat)
+    ]
+    results.append({
+        'speedup': round(results[0]['best_seconds'] / results[1]['best_seconds'], 2)
+    })
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,194 @@
+import argparse
+import http.client
+import json
+import os
+import platform
+import random
+import sqlite3
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from threading import local
+from typing import Any, Dict, List, Tuple
+from urllib.parse import urlparse
+
+from benchmarks.scenarios import Request, Scenario, select_scenarios
+from benchmarks.stats import compare, summarize
+
+
+class TestClientDriver:
+    name = 'testclient'
+
+    def __init__(self):
+        # app.py builds the application at import time from the environment.
+        from app import app
+        self.app = app
+        self._local = local()
+
+    def send(self, request: Request) -> int:
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = self.app.test_client()
+        response = client.open(request.path, method=request.method, json=request.body)
+        response.close()
+        return response.status_code
+
+
+class HTTPDriver:
+    name = 'http'
+
+    def __init__(self, base_url: str, timeout: float = 30.0):
+        parsed = urlparse(base_url)
+        self.host = parsed.hostname
+        self.port = parsed.port or 80
+        self.timeout = timeout
+        self._local = local()
+
+    def send(self, request: Request) -> int:
+        body = json.dumps(request.body) if request.body is not None else None
+        headers = {'Content-Type': 'application/json'} if body is not None else {}
+
+        connection = getattr(self._local, 'connection', None)
+        # A kept-alive connection may have been closed by the server (e.g. a
+        # recycled worker); that is retried once on a fresh connection.
+        for reused in ((True, False) if connection is not None else (False,)):
+            if not reused:
+                connection = self._local.connection = http.client.HTTPConnection(
+                    self.host, self.port, timeout=self.timeout
+                )
+            try:
+                connection.request(request.method, request.path, body=body, headers=headers)
+                response = connection.getresponse()
+                response.read()
+                return response.status
+            except (http.client.HTTPException, OSError):
+                connection.close()
+                self._local.connection = None
+                if not reused:
+                    raise
+
+
+def count_books(db_path: str) -> int:
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        return conn.execute("SELECT MAX(id) FROM book").fetchone()[0] or 1
+    finally:
+        conn.close()
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def run_scenario(
+    driver,
+    scenario: Scenario,
+    books: int,
+    requests: int,
+    concurrency: int,
+    warmup: int,
+    seed: int
+) -> Dict[str, Any]:
+    warmup_rng = random.Random(seed - 1)
+    for _ in range(warmup):
+        driver.send(scenario.build(warmup_rng, books))
+
+    def worker(index: int) -> Tuple[List[float], int]:
+        rng = random.Random(seed + index)
+        latencies, errors = [], 0
+        for _ in range(requests // concurrency + (1 if index < requests % concurrency else 0)):
+            request = scenario.build(rng, books)
+            started = time.perf_counter()
+            try:
+                status = driver.send(request)
+            except Exception:
+                status = 599
+            latencies.append(time.perf_counter() - started)
+            if status >= 400:
+                errors += 1
+        return latencies, errors
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(worker, range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies = [latency for worker_latencies, _ in results for latency in worker_latencies]
+    return summarize(latencies, sum(errors for _, errors in results), elapsed)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark the Books API')
+    parser.add_argument('--db', required=True, help='Catalog generated by benchmarks.catalog')
+    parser.add_argument('--driver', choices=['testclient', 'http'], default='testclient')
+    parser.add_argument('--url', default='http://127.0.0.1:5000', help='Base URL for the http driver')
+    parser.add_argument('--scenarios', help='Comma separated scenario names (default: all)')
+    parser.add_argument('--read-only', action='store_true', help='Skip write scenarios')
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--concurrency', type=int, default=1)
+    parser.add_argument('--warmup', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--no-response-cache', action='store_true', help='testclient only')
+    parser.add_argument('--output', help='Write results JSON here instead of stdout')
+    parser.add_argument('--compare', help='Baseline results JSON to compare p95 against')
+    parser.add_argument('--threshold', type=float, default=0.10, help='p95 regression threshold')
+    args = parser.parse_args()
+
+    scenarios = select_scenarios(args.scenarios, include_writes=not args.read_only)
+    books = count_books(args.db)
+
+    if args.driver == 'testclient':
+        os.environ['DATABASE_PATH'] = args.db
+        os.environ.setdefault('LOG_LEVEL', 'WARNING')
+        if args.no_response_cache:
+            os.environ['RESPONSE_CACHE_ENABLED'] = 'false'
+        driver = TestClientDriver()
+    else:
+        driver = HTTPDriver(args.url)
+
+    results = {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'driver': driver.name,
+            'db': os.path.abspath(args.db),
+            'books': books,
+            'requests': args.requests,
+            'concurrency': args.concurrency,
+            'seed': args.seed
+        },
+        'scenarios': {}
+    }
+
+    for scenario in scenarios:
+        results['scenarios'][scenario.name] = run_scenario(
+            driver, scenario, books, args.requests, args.concurrency, args.warmup, args.seed
+        )
+        print(f"{scenario.name}: {results['scenarios'][scenario.name]}", file=sys.stderr)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+    if args.compare:
+        with open(args.compare) as f:
+            rows = compare(json.load(f), results, args.threshold)
+        print(json.dumps(rows, indent=2), file=sys.stderr)
+        if any(row['regression'] for row in rows):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+import random
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import quote_plus
+
+from benchmarks.catalog import SUBJECTS, WORDS
+
+
+@dataclass
+class Request:
+    method: str
+    path: str
+    body: Optional[Dict[str, Any]] = None
+
+
+@dataclass
+class Scenario:
+    name: str
+    build: Callable[[random.Random, int], Request]
+    write: bool = False
+
+
+def _book_payload(rng: random.Random) -> Dict[str, Any]:
+    title = ' '.join(rng.choice(WORDS) for _ in range(3)).title()
+    return {
+        'title': title,
+        'author': f"Benchmark Author {rng.randint(1, 50)}",
+        'publisher': 'Benchmark Press',
+        'format': rng.choice(['Paperback', 'Hardcover']),
+        'pages': rng.randint(50, 900),
+        'subjects': ', '.join(rng.sample(SUBJECTS[:10], 2)),
+        'synopsis': ' '.join(rng.choices(WORDS, k=80))
+    }
+
+
+SCENARIOS: List[Scenario] = [
+    Scenario('list_default', lambda rng, n: Request('GET', '/api/v1/books?page_size=20')),
+    Scenario('list_filtered', lambda rng, n: Request(
+        'GET', f"/api/v1/books?title={rng.choice(WORDS)}&format=Hardcover&page_size=20"
+    )),
+    Scenario('list_full_text', lambda rng, n: Request(
+        'GET', f"/api/v1/books?q={rng.choice(WORDS)}+{rng.choice(WORDS)}&order_by=relevance&page_size=20"
+    )),
+    Scenario('list_subjects_all', lambda rng, n: Request(
+        'GET', f"/api/v1/books?subjects={quote_plus(','.join(rng.sample(SUBJECTS[:8], 2)))}&subjects_mode=all&page_size=20"
+    )),
+    Scenario('list_sorted_page_100', lambda rng, n: Request(
+        'GET', '/api/v1/books?order_by=title&page_size=100&fields=summary'
+    )),
+    Scenario('deep_page_offset', lambda rng, n: Request(
+        'GET', f"/api/v1/books?page={rng.randint(max(n // 40, 1) // 2, max(n // 40, 1))}&page_size=20&order_by=pubdate"
+    )),
+    Scenario('by_id', lambda rng, n: Request('GET', f"/api/v1/books/{rng.randint(1, n)}")),
+    Scenario('filter_options', lambda rng, n: Request('GET', '/api/v1/filter-options')),
+    Scenario('authors', lambda rng, n: Request('GET', '/api/v1/authors')),
+    Scenario('create_book', lambda rng, n: Request('POST', '/api/v1/books', _book_payload(rng)), write=True),
+    Scenario('update_book', lambda rng, n: Request(
+        'PUT', f"/api/v1/books/{rng.randint(1, n)}", {'pages': rng.randint(50, 900)}
+    ), write=True),
+]
+
+
+def select_scenarios(names: Optional[str], include_writes: bool = True) -> List[Scenario]:
+    if not names:
+        return [s for s in SCENARIOS if include_writes or not s.write]
+
+    by_name = {scenario.name: scenario for scenario in SCENARIOS}
+    selected = []
+    for name in names.split(','):
+        name = name.strip()
+        if name not in by_name:
+            raise ValueError(f"Unknown scenario: {name}")
+        selected.append(by_name[name])
+    return selected
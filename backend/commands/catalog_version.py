@@ -0,0 +1,18 @@
+import click
+from flask.cli import AppGroup
+from core.container import container
+
+catalog_version_cli = AppGroup('catalog-version', help='Manage the catalog version used for HTTP ETags.')
+
+
+@catalog_version_cli.command('create')
+def create_catalog_version():
+    container.get('catalog_version').create()
+    click.echo("Catalog version table and triggers created")
+    click.echo("Restart the API so ETags come from the shared catalog version")
+
+
+@catalog_version_cli.command('drop')
+def drop_catalog_version():
+    container.get('catalog_version').drop()
+    click.echo("Catalog version table dropped")
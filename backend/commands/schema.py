@@ -0,0 +1,45 @@
+import click
+from flask.cli import AppGroup
+from core.container import container
+
+schema_cli = AppGroup('schema', help='Manage database indexes and inspect query plans.')
+
+
+def get_schema_service():
+    return container.get('schema_service')
+
+
+@schema_cli.command('ensure-indexes')
+@click.option('--no-analyze', is_flag=True, help='Skip ANALYZE after creating indexes.')
+def ensure_indexes(no_analyze: bool):
+    created = get_schema_service().ensure_indexes(analyze=not no_analyze)
+    if created:
+        click.echo(f"Created indexes: {', '.join(created)}")
+    else:
+        click.echo("All required indexes already exist")
+
+
+@schema_cli.command('drop-indexes')
+def drop_indexes():
+    dropped = get_schema_service().drop_indexes()
+    click.echo(f"Dropped indexes: {', '.join(dropped) or 'none'}")
+
+
+@schema_cli.command('status')
+def index_status():
+    for name, info in get_schema_service().status().items():
+        marker = 'ok' if info['present'] else 'MISSING'
+        click.echo(f"{marker:8} {name} ON {info['table']}({', '.join(info['columns'])})")
+
+
+@schema_cli.command('explain')
+@click.argument('query')
+def explain_query(query: str):
+    guard = container.get('query_plan_guard')
+    plan = guard.explain(query)
+    for detail in plan:
+        click.echo(detail)
+    
+    problems = guard.find_problems(plan, query)
+    if problems:
+        raise click.ClickException(f"Query plan problems: {problems}")
@@ -0,0 +1,40 @@
+import click
+from flask.cli import AppGroup
+from core.container import container
+
+search_index_cli = AppGroup('search-index', help='Manage the full-text search index.')
+
+
+def get_search_index_service():
+    return container.get('search_index_service')
+
+
+@search_index_cli.command('create')
+@click.option('--no-backfill', is_flag=True, help='Only create the table and triggers.')
+def create_search_index(no_backfill: bool):
+    search_index = get_search_index_service()
+    search_index.create()
+    click.echo("Full-text index and sync triggers created")
+    
+    if not no_backfill:
+        indexed = search_index.rebuild()
+        click.echo(f"Backfilled {indexed} books")
+    
+    click.echo("Restart the API to switch text filters to the full-text index")
+
+
+@search_index_cli.command('rebuild')
+def rebuild_search_index():
+    search_index = get_search_index_service()
+    if not search_index.is_available():
+        raise click.ClickException("Full-text index does not exist, run 'search-index create' first")
+    
+    indexed = search_index.rebuild()
+    search_index.optimize()
+    click.echo(f"Rebuilt full-text index for {indexed} books")
+
+
+@search_index_cli.command('drop')
+def drop_search_index():
+    get_search_index_service().drop()
+    click.echo("Full-text index dropped")
@@ -0,0 +1,39 @@
+import click
+from flask.cli import AppGroup
+from core.container import container
+
+subjects_cli = AppGroup('subjects', help='Manage the materialized subject catalog.')
+
+
+def get_subject_catalog():
+    return container.get('subject_catalog')
+
+
+@subjects_cli.command('create')
+@click.option('--no-backfill', is_flag=True, help='Only create the table.')
+def create_subject_catalog(no_backfill: bool):
+    catalog = get_subject_catalog()
+    catalog.create()
+    click.echo("Subject catalog created")
+    
+    if not no_backfill:
+        entries = catalog.rebuild()
+        click.echo(f"Backfilled {entries} subject entries")
+    
+    click.echo("Restart the API so the subject filter and listings read from the catalog")
+
+
+@subjects_cli.command('rebuild')
+def rebuild_subject_catalog():
+    catalog = get_subject_catalog()
+    if not catalog.is_available():
+        raise click.ClickException("Subject catalog does not exist, run 'subjects create' first")
+    
+    entries = catalog.rebuild()
+    click.echo(f"Rebuilt subject catalog with {entries} entries")
+
+
+@subjects_cli.command('drop')
+def drop_subject_catalog():
+    get_subject_catalog().drop()
+    click.echo("Subject catalog dropped")
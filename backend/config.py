@@ -8,18 +8,122 @@ class Config:
     DEBUG = False
     TESTING = False
     
+    HOST = os.environ.get('HOST') or '0.0.0.0'
+    PORT = int(os.environ.get('PORT') or 5000)
+    
+    # Read by gunicorn.conf.py. Every worker opens its own connection pools,
+    # so DB_POOL_SIZE should stay at or above GUNICORN_THREADS.
+    GUNICORN_WORKERS = int(os.environ.get('GUNICORN_WORKERS') or (os.cpu_count() or 1) * 2 + 1)
+    GUNICORN_THREADS = int(os.environ.get('GUNICORN_THREADS') or 4)
+    GUNICORN_WORKER_CLASS = os.environ.get('GUNICORN_WORKER_CLASS') or 'gthread'
+    GUNICORN_KEEPALIVE = int(os.environ.get('GUNICORN_KEEPALIVE') or 5)
+    GUNICORN_TIMEOUT = int(os.environ.get('GUNICORN_TIMEOUT') or 30)
+    GUNICORN_GRACEFUL_TIMEOUT = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT') or 30)
+    GUNICORN_MAX_REQUESTS = int(os.environ.get('GUNICORN_MAX_REQUESTS') or 1000)
+    GUNICORN_MAX_REQUESTS_JITTER = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER') or 100)
+    GUNICORN_PRELOAD = (os.environ.get('GUNICORN_PRELOAD') or 'true').lower() == 'true'
+    
     DATABASE_PATH = os.environ.get('DATABASE_PATH') or 'db.sqlite'
     
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE') or 5)
+    # Threads a2wsgi runs requests on under asgi.py; more than DB_POOL_SIZE
+    # only queues reads on the pool. The ASGI mode has no async read path:
+    # every request, reads included, is the blocking Flask app on one of
+    # these threads. Overlapping the count and page queries of a listing is
+    # LIST_QUERY_MODE=concurrent, which works the same under WSGI.
+    ASYNC_WORKERS = int(os.environ.get('ASYNC_WORKERS') or DB_POOL_SIZE)
+    DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT') or 5.0)
+    DB_POOL_IDLE_TIMEOUT = float(os.environ.get('DB_POOL_IDLE_TIMEOUT') or 300.0)
+    DB_POOL_VALIDATE = (os.environ.get('DB_POOL_VALIDATE') or 'true').lower() == 'true'
+    DB_WRITE_TIMEOUT = float(os.environ.get('DB_WRITE_TIMEOUT') or 10.0)
+    
+    SQLITE_JOURNAL_MODE = os.environ.get('SQLITE_JOURNAL_MODE') or 'WAL'
+    SQLITE_SYNCHRONOUS = os.environ.get('SQLITE_SYNCHRONOUS') or 'NORMAL'
+    SQLITE_CACHE_SIZE = int(os.environ.get('SQLITE_CACHE_SIZE') or -16000)
+    SQLITE_MMAP_SIZE = int(os.environ.get('SQLITE_MMAP_SIZE') or 268435456)
+    SQLITE_TEMP_STORE = os.environ.get('SQLITE_TEMP_STORE') or 'MEMORY'
+    SQLITE_BUSY_TIMEOUT = int(os.environ.get('SQLITE_BUSY_TIMEOUT') or 5000)
+    
     DEFAULT_PAGE_SIZE = 10
     MAX_PAGE_SIZE = 100
     
+    BULK_BATCH_SIZE = int(os.environ.get('BULK_BATCH_SIZE') or 500)
+    BULK_MAX_BATCH_SIZE = 5000
+    
+    CONDITIONAL_BLUEPRINTS = ['books', 'authors']
+    CACHE_CONTROL = {
+        'books': os.environ.get('CACHE_CONTROL_BOOKS') or 'public, max-age=0, must-revalidate',
+        'authors': os.environ.get('CACHE_CONTROL_AUTHORS') or 'public, max-age=0, must-revalidate',
+        'health': os.environ.get('CACHE_CONTROL_HEALTH') or 'no-store',
+        'metrics': 'no-store'
+    }
+    
+    COMPRESSION_ENABLED = (os.environ.get('COMPRESSION_ENABLED') or 'true').lower() == 'true'
+    COMPRESSION_MIN_SIZE = int(os.environ.get('COMPRESSION_MIN_SIZE') or 1024)
+    COMPRESSION_LEVEL = int(os.environ.get('COMPRESSION_LEVEL') or 6)
+    COMPRESSION_CACHE_SIZE = int(os.environ.get('COMPRESSION_CACHE_SIZE') or 256)
+    COMPRESSION_CACHE_TTL = float(os.environ.get('COMPRESSION_CACHE_TTL') or 300.0)
+    
+    METRICS_ENABLED = (os.environ.get('METRICS_ENABLED') or 'true').lower() == 'true'
+    # Shared directory for per-worker snapshots; unset keeps metrics in
+    # process (single worker).
+    METRICS_DIR = os.environ.get('METRICS_DIR') or None
+    METRICS_FLUSH_INTERVAL = float(os.environ.get('METRICS_FLUSH_INTERVAL') or 1.0)
+    METRICS_MAX_QUERY_SHAPES = int(os.environ.get('METRICS_MAX_QUERY_SHAPES') or 200)
+    
+    # off, header (only requests sending PROFILER_HEADER: 1) or always.
+    PROFILER_MODE = os.environ.get('PROFILER_MODE') or 'off'
+    PROFILER_HEADER = os.environ.get('PROFILER_HEADER') or 'X-Profile'
+    PROFILER_EXPLAIN = (os.environ.get('PROFILER_EXPLAIN') or 'true').lower() == 'true'
+    PROFILER_MAX_TRACES = int(os.environ.get('PROFILER_MAX_TRACES') or 100)
+    SLOW_QUERY_MS = float(os.environ.get('SLOW_QUERY_MS') or 250)
+    
+    JSON_ENCODER = os.environ.get('JSON_ENCODER') or 'auto'
+    # Unset keeps Flask's behaviour: indented in debug, compact otherwise.
+    JSON_COMPACT = {'true': True, 'false': False}.get((os.environ.get('JSON_COMPACT') or '').lower())
+    
+    DB_ITER_CHUNK_SIZE = int(os.environ.get('DB_ITER_CHUNK_SIZE') or 1000)
+    EXPORT_CHUNK_SIZE = int(os.environ.get('EXPORT_CHUNK_SIZE') or 1000)
+    
+    # sequential, concurrent (COUNT(*) on QUERY_EXECUTOR_WORKERS threads
+    # alongside the page query) or window (one query with COUNT(*) OVER ()).
+    LIST_QUERY_MODE = os.environ.get('LIST_QUERY_MODE') or 'sequential'
+    LIST_QUERY_TIMEOUT = float(os.environ.get('LIST_QUERY_TIMEOUT') or 10.0)
+    QUERY_EXECUTOR_WORKERS = int(os.environ.get('QUERY_EXECUTOR_WORKERS') or DB_POOL_SIZE)
+    
+    # Identical concurrent GET /books calls share one execution; waiters
+    # give up after SINGLE_FLIGHT_TIMEOUT seconds and run the query themselves.
+    SINGLE_FLIGHT_ENABLED = (os.environ.get('SINGLE_FLIGHT_ENABLED') or 'true').lower() == 'true'
+    SINGLE_FLIGHT_TIMEOUT = float(os.environ.get('SINGLE_FLIGHT_TIMEOUT') or 30.0)
+    
+    COUNT_CACHE_SIZE = int(os.environ.get('COUNT_CACHE_SIZE') or 1024)
+    COUNT_CACHE_TTL = float(os.environ.get('COUNT_CACHE_TTL') or 300.0)
+    COUNT_ESTIMATE_CAP = int(os.environ.get('COUNT_ESTIMATE_CAP') or 10000)
+    
+    RESPONSE_CACHE_ENABLED = (os.environ.get('RESPONSE_CACHE_ENABLED') or 'true').lower() == 'true'
+    RESPONSE_CACHE_SIZE = int(os.environ.get('RESPONSE_CACHE_SIZE') or 2048)
+    RESPONSE_CACHE_TTL = float(os.environ.get('RESPONSE_CACHE_TTL') or 60.0)
+    # Seconds a worker trusts its copy of catalog_meta; writes by other
+    # workers or outside the API reach its ETags and caches within this.
+    CATALOG_VERSION_TTL = float(os.environ.get('CATALOG_VERSION_TTL') or 1.0)
+    
     CORS_ORIGINS = ["http://localhost:3000", "http://frontend:3000"]
     
     LOG_LEVEL = os.environ.get('LOG_LEVEL') or 'INFO'
+    LOG_FORMAT = os.environ.get('LOG_FORMAT') or 'json'
+    # Comma separated logger=LEVEL and logger=rate pairs, e.g.
+    # "services.database_service=DEBUG" or "middleware.logging_middleware=0.1".
+    LOG_LEVELS = os.environ.get('LOG_LEVELS') or ''
+    LOG_SAMPLE_RATES = os.environ.get('LOG_SAMPLE_RATES') or ''
+    
+    QUERY_PLAN_GUARD = os.environ.get('QUERY_PLAN_GUARD') or 'off'
 
 
 class DevelopmentConfig(Config):
     DEBUG = True
+    LOG_FORMAT = os.environ.get('LOG_FORMAT') or 'text'
+    PROFILER_MODE = os.environ.get('PROFILER_MODE') or 'header'
+    QUERY_PLAN_GUARD = os.environ.get('QUERY_PLAN_GUARD') or 'warn'
 
 
 class ProductionConfig(Config):
@@ -29,6 +133,7 @@ class ProductionConfig(Config):
 class TestingConfig(Config):
     TESTING = True
     DATABASE_PATH = ':memory:'
+    QUERY_PLAN_GUARD = os.environ.get('QUERY_PLAN_GUARD') or 'raise'
 
 
 config_by_name: Dict[str, Any] = {
@@ -0,0 +1,151 @@
+import json
+import time
+import inspect
+import logging
+from collections import OrderedDict
+from functools import wraps
+from threading import Lock
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class LRUCache:
+    def __init__(self, max_entries: int = 1024, ttl: float = 300.0, version_source: Callable[[], Any] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # Returns a version of the underlying data that every process can
+        # see (the catalog_meta row). A change starts a new generation, so
+        # writes made by other workers or outside the API invalidate too.
+        self.version_source = version_source
+        self._source_version = None
+        self._entries: 'OrderedDict[Any, Tuple[Any, int, float]]' = OrderedDict()
+        self._generation = 0
+        self._lock = Lock()
+        self._stats = {
+            'hits': 0,
+            'stale_hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'expirations': 0,
+            'invalidations': 0
+        }
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def sync(self) -> None:
+        if self.version_source is None:
+            return
+        try:
+            version = self.version_source()
+        except Exception as e:
+            logger.warning(f"Could not read cache version: {e}")
+            return
+        with self._lock:
+            if version != self._source_version:
+                if self._source_version is not None:
+                    self._generation += 1
+                    self._stats['invalidations'] += 1
+                self._source_version = version
+
+    def lookup(self, key: Any, allow_stale: bool = False) -> Tuple[bool, Any, bool]:
+        self.sync()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats['misses'] += 1
+                return False, None, False
+
+            value, generation, stored_at = entry
+            if self.ttl and time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                self._stats['expirations'] += 1
+                self._stats['misses'] += 1
+                return False, None, False
+
+            fresh = generation == self._generation
+            if not fresh:
+                if not allow_stale:
+                    self._stats['misses'] += 1
+                    return False, None, False
+                self._stats['stale_hits'] += 1
+            else:
+                self._stats['hits'] += 1
+
+            self._entries.move_to_end(key)
+            return True, value, fresh
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        found, value, _ = self.lookup(key)
+        return value if found else default
+
+    def set(self, key: Any, value: Any, generation: Optional[int] = None) -> None:
+        with self._lock:
+            # A value loaded before a write finished must not be stored as
+            # fresh, otherwise it would outlive the invalidation.
+            if generation is not None and generation != self._generation:
+                return
+
+            self._entries[key] = (value, self._generation, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    def invalidate(self) -> None:
+        # Entries stay in place so stale reads remain possible; LRU and TTL
+        # age them out.
+        with self._lock:
+            self._generation += 1
+            self._stats['invalidations'] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._stats['hits'] + self._stats['stale_hits'] + self._stats['misses']
+            return {
+                **self._stats,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'generation': self._generation,
+                'hit_ratio': round((self._stats['hits'] + self._stats['stale_hits']) / lookups, 4) if lookups else 0.0
+            }
+
+
+def make_cache_key(namespace: str, arguments: Dict[str, Any]) -> str:
+    return json.dumps([namespace, arguments], sort_keys=True, default=str)
+
+
+def cached_method(namespace: str, cache_attr: str = 'response_cache'):
+
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @wraps(func)
+        def wrapper(self, *args, **kwargs):
+            cache = getattr(self, cache_attr, None)
+            if cache is None:
+                return func(self, *args, **kwargs)
+
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            arguments = dict(bound.arguments)
+            arguments.pop('self', None)
+            key = make_cache_key(namespace, arguments)
+
+            found, value, _ = cache.lookup(key)
+            if found:
+                return value
+
+            generation = cache.generation
+            value = func(self, *args, **kwargs)
+            cache.set(key, value, generation=generation)
+            return value
+
+        return wrapper
+    return decorator
@@ -27,26 +27,29 @@ class ServiceContainer:
     
     def register_singleton(self, service_name: str, factory: callable) -> None:
         self._factories[service_name] = factory
-        logger.debug(f"Registered singleton: {service_name}")
+        logger.debug("Registered singleton: %s", service_name)
     
     def register_transient(self, service_name: str, factory: callable) -> None:
         self._services[service_name] = factory
-        logger.debug(f"Registered transient: {service_name}")
+        logger.debug("Registered transient: %s", service_name)
     
     def get(self, service_name: str) -> Any:
         if service_name in self._factories:
             if service_name not in self._singletons:
                 self._singletons[service_name] = self._factories[service_name]()
-                logger.debug(f"Created singleton instance: {service_name}")
+                logger.debug("Created singleton instance: %s", service_name)
             return self._singletons[service_name]
         
         if service_name in self._services:
             instance = self._services[service_name]()
-            logger.debug(f"Created transient instance: {service_name}")
+            logger.debug("Created transient instance: %s", service_name)
             return instance
         
         raise ValueError(f"Service '{service_name}' not registered")
     
+    def get_existing(self, service_name: str) -> Optional[Any]:
+        return self._singletons.get(service_name)
+    
     def clear(self) -> None:
         self._services.clear()
         self._factories.clear()
@@ -0,0 +1,11 @@
+import contextvars
+from concurrent.futures import Executor, Future
+from typing import Any, Callable, TypeVar
+
+T = TypeVar('T')
+
+
+# Runs func under a copy of the caller's contextvars, which is where Flask
+# keeps its app/request context (and g).
+def submit(executor: Executor, func: Callable[..., T], *args: Any, **kwargs: Any) -> 'Future[T]':
+    return executor.submit(contextvars.copy_context().run, func, *args, **kwargs)
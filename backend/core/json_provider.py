@@ -0,0 +1,106 @@
+import re
+import math
+import time
+import logging
+from typing import Any, Optional
+
+from flask import Flask, Response
+from flask.json.provider import DefaultJSONProvider
+
+from core.profiling import record_timing
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+JSON_ENCODERS = ('auto', 'orjson', 'stdlib')
+
+# orjson writes exponents as 1e20 where the stdlib writes 1e+20.
+_EXPONENT = re.compile(rb'[0-9]e-?[0-9]')
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    def __init__(self, app: Flask, encoder: str = 'auto'):
+        super().__init__(app)
+
+        if encoder not in JSON_ENCODERS:
+            raise ValueError(f"JSON encoder must be one of: {', '.join(JSON_ENCODERS)}")
+        if encoder == 'orjson' and orjson is None:
+            logger.warning("orjson is not installed, falling back to the stdlib JSON encoder")
+
+        self.encoder = 'stdlib' if encoder == 'stdlib' or orjson is None else 'orjson'
+
+    def _fast_dumps(self, obj: Any, indent: bool) -> Optional[bytes]:
+        if self.encoder != 'orjson':
+            return None
+
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_PASSTHROUGH_SUBCLASS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+
+        try:
+            data = orjson.dumps(obj, default=self.default, option=option)
+        except TypeError:
+            return None
+
+        # Output has to match the stdlib encoder byte for byte, so anything
+        # the two encode differently goes through the stdlib instead.
+        if self.ensure_ascii and (not data.isascii() or b'\x7f' in data):
+            return None
+        if _EXPONENT.search(data):
+            return None
+        return data
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if kwargs == {'separators': (',', ':')} or kwargs == {'indent': 2}:
+            data = self._fast_dumps(obj, indent='indent' in kwargs)
+            if data is not None:
+                return data.decode()
+
+        # orjson writes NaN and +/-Infinity as null, the stdlib as the
+        # non-JSON NaN/Infinity. Finite data, the common case, is encoded
+        # once; only a rejected document is walked to null the others.
+        kwargs.setdefault('allow_nan', False)
+        try:
+            return super().dumps(obj, **kwargs)
+        except ValueError:
+            if kwargs['allow_nan']:
+                raise
+            return super().dumps(_null_non_finite(obj), **kwargs)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        started = time.perf_counter()
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+
+        data = self._fast_dumps(obj, indent)
+        if data is None:
+            response = super().response(obj)
+        else:
+            response = self._app.response_class(data + b'\n', mimetype=self.mimetype)
+
+        record_timing('serialize', time.perf_counter() - started)
+        return response
+
+
+def _null_non_finite(obj: Any) -> Any:
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {key: _null_non_finite(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_null_non_finite(value) for value in obj]
+    return obj
+
+
+def setup_json_provider(app: Flask) -> None:
+    provider = FastJSONProvider(app, encoder=app.config.get('JSON_ENCODER', 'auto'))
+    provider.compact = app.config.get('JSON_COMPACT')
+    app.json = provider
+    logger.info("JSON provider using %s encoder", provider.encoder)
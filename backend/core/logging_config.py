@@ -0,0 +1,130 @@
+import sys
+import json
+import queue
+import atexit
+import random
+import logging
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional
+from flask import g, has_app_context
+
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Attributes every LogRecord has; anything else was passed through `extra`.
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime'}
+
+_listener: Optional[QueueListener] = None
+
+
+def parse_logger_settings(value: Optional[str]) -> Dict[str, str]:
+    settings = {}
+    for item in (value or '').split(','):
+        if '=' in item:
+            name, setting = item.split('=', 1)
+            settings[name.strip()] = setting.strip()
+    return settings
+
+
+class JSONFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage()
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        # Warnings and errors are never sampled away.
+        if record.levelno >= logging.WARNING or not self.rates:
+            return True
+
+        name = record.name
+        while name:
+            if name in self.rates:
+                return random.random() < self.rates[name]
+            name = name.rpartition('.')[0]
+        return True
+
+
+class AsyncQueueHandler(QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merges msg and args in the calling thread, as QueueHandler.prepare
+        # does, so a dict or list the caller mutates afterwards is logged
+        # with its state at the call. Records dropped by level or sampling
+        # never reach this point, and rendering the line (timestamp, JSON,
+        # traceback) still happens on the listener thread. The request id
+        # is captured here too, while g is still bound.
+        record.msg = record.getMessage()
+        record.args = None
+        if not hasattr(record, 'request_id') and has_app_context():
+            request_id = g.get('request_id')
+            if request_id is not None:
+                record.request_id = request_id
+        return record
+
+
+def configure_logging(config) -> None:
+    global _listener
+    stop_logging()
+
+    if getattr(config, 'LOG_FORMAT', 'text') == 'json':
+        formatter: logging.Formatter = JSONFormatter()
+    else:
+        formatter = logging.Formatter(TEXT_FORMAT)
+
+    stream_handler = logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(formatter)
+
+    log_queue: queue.Queue = queue.Queue(-1)
+    queue_handler = AsyncQueueHandler(log_queue)
+    rates = {
+        name: float(rate)
+        for name, rate in parse_logger_settings(getattr(config, 'LOG_SAMPLE_RATES', None)).items()
+    }
+    queue_handler.addFilter(SamplingFilter(rates))
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(getattr(logging, config.LOG_LEVEL))
+
+    for name, level in parse_logger_settings(getattr(config, 'LOG_LEVELS', None)).items():
+        logging.getLogger(name).setLevel(getattr(logging, level.upper()))
+
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+
+
+def restart_logging(config) -> None:
+    global _listener
+    # After a fork the listener thread no longer exists and its queue lock
+    # may have been held mid-put, so the old pipeline is abandoned rather
+    # than stopped.
+    _listener = None
+    configure_logging(config)
+
+
+def stop_logging() -> None:
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(stop_logging)
@@ -0,0 +1,392 @@
+import os
+import re
+import json
+import glob
+import time
+import uuid
+import atexit
+import logging
+from bisect import bisect_left
+from collections import defaultdict
+from threading import Event, Lock, Thread
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+ROW_BUCKETS = (0, 1, 10, 25, 50, 100, 250, 1000, 10000, 100000)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+# Counters and histograms of exited workers, merged by the gunicorn master.
+EXITED_SNAPSHOT = 'metrics-exited.json'
+
+
+def normalize_query(query: str) -> str:
+    # FilterCombiner binds values as parameters, but LIMIT/OFFSET and IN
+    # lists still vary with the request; fold them so one filter
+    # combination maps to one shape.
+    shape = _STRING_LITERAL.sub('?', query)
+    shape = _NUMBER_LITERAL.sub('?', shape)
+    shape = _PLACEHOLDER_LIST.sub('(?, ...)', shape)
+    return _WHITESPACE.sub(' ', shape).strip()
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    items = list(labels) + ([extra] if extra else [])
+    if not items:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in items) + '}'
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class MetricsRegistry:
+    def __init__(self, snapshot_dir: Optional[str] = None, flush_interval: float = 1.0):
+        self.snapshot_dir = snapshot_dir
+        self.flush_interval = flush_interval
+        self._definitions: Dict[str, Tuple[str, str, Tuple[float, ...]]] = {}
+        self._counters: Dict[Tuple[str, LabelKey], float] = defaultdict(float)
+        self._gauges: Dict[Tuple[str, LabelKey], float] = defaultdict(float)
+        self._histograms: Dict[Tuple[str, LabelKey], List[Any]] = {}
+        self._collectors: List[Callable[['MetricsRegistry'], None]] = []
+        self._lock = Lock()
+        self._last_flush = 0.0
+        self._flush_lock = Lock()
+        self._flusher_stop: Optional[Event] = None
+        # Names this process's snapshot; a pid reused by a later worker gets
+        # a file of its own instead of overwriting the earlier totals.
+        self._snapshot_token = uuid.uuid4().hex[:12]
+
+        if snapshot_dir:
+            os.makedirs(snapshot_dir, exist_ok=True)
+            # Request flushes are throttled and an idle worker makes none;
+            # the flusher thread covers the gap, and exit writes the rest.
+            atexit.register(self.flush, True)
+
+    def start_flusher(self) -> None:
+        with self._flush_lock:
+            if not self.snapshot_dir or self._flusher_stop is not None:
+                return
+            stop = self._flusher_stop = Event()
+
+        def run():
+            while not stop.wait(self.flush_interval):
+                self.flush(force=True)
+
+        Thread(target=run, name='metrics-flusher', daemon=True).start()
+
+    def stop_flusher(self) -> None:
+        if self._flusher_stop is not None:
+            self._flusher_stop.set()
+            self._flusher_stop = None
+
+    def reset_after_fork(self) -> None:
+        # Values recorded by the parent (e.g. a preloading master) would be
+        # reported again under the child's pid.
+        self._counters = defaultdict(float)
+        self._gauges = defaultdict(float)
+        self._histograms = {}
+        self._lock = Lock()
+        self._last_flush = 0.0
+        # Threads do not survive fork; the child's first flush starts its own.
+        self._flush_lock = Lock()
+        self._flusher_stop = None
+        self._snapshot_token = uuid.uuid4().hex[:12]
+
+    def counter(self, name: str, help_text: str) -> None:
+        self._definitions[name] = ('counter', help_text, ())
+
+    def gauge(self, name: str, help_text: str) -> None:
+        self._definitions[name] = ('gauge', help_text, ())
+
+    def histogram(self, name: str, help_text: str, buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        self._definitions[name] = ('histogram', help_text, tuple(buckets))
+
+    def add_collector(self, collector: Callable[['MetricsRegistry'], None]) -> None:
+        self._collectors.append(collector)
+
+    def inc(self, name: str, value: float = 1.0, **labels: Any) -> None:
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] += value
+
+    def set_counter(self, name: str, value: float, **labels: Any) -> None:
+        # For totals a service already keeps (pool, cache stats): the
+        # current value replaces the sample instead of being added to it.
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = value
+
+    def set_gauge(self, name: str, value: float, **labels: Any) -> None:
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._gauges[key] = value
+
+    def add_gauge(self, name: str, value: float, **labels: Any) -> None:
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._gauges[key] += value
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        buckets = self._definitions[name][2]
+        index = bisect_left(buckets, value)
+        key = (name, _label_key(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                # One slot per bucket plus +Inf, then sum and count.
+                histogram = self._histograms[key] = [[0] * (len(buckets) + 1), 0.0, 0]
+            histogram[0][index] += 1
+            histogram[1] += value
+            histogram[2] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        for collector in self._collectors:
+            try:
+                collector(self)
+            except Exception as e:
+                logger.warning(f"Metrics collector failed: {e}")
+
+        with self._lock:
+            return {
+                'pid': os.getpid(),
+                'counters': [[name, labels, value] for (name, labels), value in self._counters.items()],
+                'gauges': [[name, labels, value] for (name, labels), value in self._gauges.items()],
+                'histograms': [
+                    [name, labels, list(counts), total, count]
+                    for (name, labels), (counts, total, count) in self._histograms.items()
+                ]
+            }
+
+    def flush(self, force: bool = False) -> None:
+        if not self.snapshot_dir:
+            return
+
+        # Started from the first flush rather than at creation, so a
+        # preloading master that never serves requests writes no snapshots.
+        self.start_flusher()
+
+        now = time.monotonic()
+        if not force and now - self._last_flush < self.flush_interval:
+            return
+        self._last_flush = now
+
+        path = os.path.join(self.snapshot_dir, f"metrics-{os.getpid()}-{self._snapshot_token}.json")
+        temp_path = f"{path}.tmp"
+        with self._flush_lock:
+            try:
+                with open(temp_path, 'w') as f:
+                    json.dump(self.snapshot(), f)
+                os.replace(temp_path, path)
+            except OSError as e:
+                logger.warning(f"Could not write metrics snapshot: {e}")
+
+    def _load_snapshots(self) -> List[Dict[str, Any]]:
+        if not self.snapshot_dir:
+            return [self.snapshot()]
+
+        self.flush(force=True)
+        snapshots = {}
+        for path in glob.glob(os.path.join(self.snapshot_dir, 'metrics-*.json')):
+            name = os.path.basename(path)
+            if name == EXITED_SNAPSHOT:
+                continue
+            snapshot = _read_snapshot(path)
+            if snapshot is not None:
+                snapshots[name] = snapshot
+
+        # Read last: the master rewrites it before deleting the files it
+        # merged, so a file read above is either listed here or not yet in it.
+        exited = _read_snapshot(os.path.join(self.snapshot_dir, EXITED_SNAPSHOT))
+        if exited is None:
+            return list(snapshots.values())
+        for name in exited.get('merged', []):
+            snapshots.pop(name, None)
+        return list(snapshots.values()) + [exited]
+
+    @staticmethod
+    def _process_alive(pid: Optional[int]) -> bool:
+        if pid is None:
+            return False
+        if pid == os.getpid():
+            return True
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+        return True
+
+    def collect(self) -> Dict[str, Any]:
+        counters: Dict[Tuple[str, LabelKey], float] = defaultdict(float)
+        gauges: Dict[Tuple[str, LabelKey], float] = defaultdict(float)
+        histograms: Dict[Tuple[str, LabelKey], List[Any]] = {}
+
+        # Counters and histograms of exited workers are kept so totals never
+        # go backwards; their gauges no longer describe anything live.
+        for snapshot in self._load_snapshots():
+            _accumulate(snapshot, counters, histograms)
+            if self._process_alive(snapshot['pid']):
+                for name, labels, value in snapshot['gauges']:
+                    gauges[(name, tuple(map(tuple, labels)))] += value
+
+        return {'counters': counters, 'gauges': gauges, 'histograms': histograms}
+
+    def render(self) -> str:
+        collected = self.collect()
+        samples: Dict[str, List[str]] = defaultdict(list)
+
+        for (name, labels), value in sorted(collected['counters'].items()):
+            samples[name].append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        for (name, labels), value in sorted(collected['gauges'].items()):
+            samples[name].append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        for (name, labels), (counts, total, count) in sorted(collected['histograms'].items()):
+            buckets = self._definitions.get(name, ('histogram', '', ()))[2]
+            cumulative = 0
+            for bound, bucket_count in zip(list(buckets) + [float('inf')], counts):
+                cumulative += bucket_count
+                samples[name].append(
+                    f"{name}_bucket{_format_labels(labels, ('le', _format_value(bound)))} {cumulative}"
+                )
+            samples[name].append(f"{name}_sum{_format_labels(labels)} {_format_value(total)}")
+            samples[name].append(f"{name}_count{_format_labels(labels)} {count}")
+
+        lines = []
+        for name in sorted(samples):
+            metric_type, help_text, _ = self._definitions.get(name, ('untyped', '', ()))
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            lines.extend(samples[name])
+        return '\n'.join(lines) + '\n'
+
+
+def _read_snapshot(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"Skipping unreadable metrics snapshot {path}: {e}")
+        return None
+
+
+def _accumulate(
+    snapshot: Dict[str, Any],
+    counters: Dict[Tuple[str, LabelKey], float],
+    histograms: Dict[Tuple[str, LabelKey], List[Any]]
+) -> None:
+    for name, labels, value in snapshot['counters']:
+        counters[(name, tuple(map(tuple, labels)))] += value
+    for name, labels, counts, total, count in snapshot['histograms']:
+        key = (name, tuple(map(tuple, labels)))
+        merged = histograms.get(key)
+        if merged is None:
+            histograms[key] = [list(counts), total, count]
+        else:
+            merged[0] = [a + b for a, b in zip(merged[0], counts)]
+            merged[1] += total
+            merged[2] += count
+
+
+def merge_exited_snapshots(snapshot_dir: str, pid: int) -> None:
+    # Folds an exited worker's snapshots into EXITED_SNAPSHOT and deletes
+    # them, so recycled workers (max_requests) do not pile up files. Only
+    # the gunicorn master calls this, one worker at a time.
+    paths = glob.glob(os.path.join(snapshot_dir, f"metrics-{pid}-*.json"))
+    if not paths:
+        return
+
+    exited_path = os.path.join(snapshot_dir, EXITED_SNAPSHOT)
+    counters: Dict[Tuple[str, LabelKey], float] = defaultdict(float)
+    histograms: Dict[Tuple[str, LabelKey], List[Any]] = {}
+    previous = _read_snapshot(exited_path)
+    if previous is not None:
+        _accumulate(previous, counters, histograms)
+    for path in paths:
+        snapshot = _read_snapshot(path)
+        if snapshot is not None:
+            _accumulate(snapshot, counters, histograms)
+
+    exited = {
+        'pid': None,
+        # Files from earlier merges are gone by now; only this batch can
+        # still be seen by a concurrent reader.
+        'merged': [os.path.basename(path) for path in paths],
+        'counters': [[name, labels, value] for (name, labels), value in counters.items()],
+        'gauges': [],
+        'histograms': [
+            [name, labels, list(counts), total, count]
+            for (name, labels), (counts, total, count) in histograms.items()
+        ]
+    }
+    temp_path = f"{exited_path}.tmp"
+    try:
+        with open(temp_path, 'w') as f:
+            json.dump(exited, f)
+        os.replace(temp_path, exited_path)
+    except OSError as e:
+        logger.warning(f"Could not merge metrics snapshots of worker {pid}: {e}")
+        return
+
+    for path in paths:
+        try:
+            os.remove(path)
+        except OSError as e:
+            logger.warning(f"Could not remove metrics snapshot {path}: {e}")
+
+
+class QueryMetricsListener:
+    def __init__(self, registry: MetricsRegistry, max_shapes: int = 200):
+        self.registry = registry
+        self.max_shapes = max_shapes
+        self._shapes: Dict[str, str] = {}
+        self._known_shapes = set()
+        self._lock = Lock()
+
+        registry.histogram('db_query_duration_seconds', 'Query latency by operation and shape', QUERY_LATENCY_BUCKETS)
+        registry.histogram('db_query_rows', 'Rows returned or affected per query', ROW_BUCKETS)
+
+    def _shape(self, query: str) -> str:
+        shape = self._shapes.get(query)
+        if shape is not None:
+            return shape
+
+        shape = normalize_query(query)
+        with self._lock:
+            # Bounds label cardinality should some caller build queries
+            # that normalize to unbounded variations.
+            if shape not in self._known_shapes:
+                if len(self._known_shapes) >= self.max_shapes:
+                    shape = 'other'
+                else:
+                    self._known_shapes.add(shape)
+            if len(self._shapes) < self.max_shapes * 10:
+                self._shapes[query] = shape
+        return shape
+
+    def __call__(self, operation: str, query: str, parameters: List[Any], duration: float, rows: int) -> None:
+        shape = self._shape(query)
+        self.registry.observe('db_query_duration_seconds', duration, operation=operation, shape=shape)
+        self.registry.observe('db_query_rows', max(rows, 0), operation=operation, shape=shape)
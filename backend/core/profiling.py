@@ -0,0 +1,75 @@
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+from flask import g, has_app_context
+
+
+@dataclass
+class QueryRecord:
+    operation: str
+    query: str
+    parameters: List[Any]
+    duration_ms: float
+    rows: int
+    plan: Optional[List[str]] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'operation': self.operation,
+            'query': self.query,
+            'parameters': self.parameters,
+            'duration_ms': self.duration_ms,
+            'rows': self.rows,
+            'plan': self.plan
+        }
+
+
+@dataclass
+class RequestTrace:
+    request_id: str
+    method: str
+    path: str
+    started: float = field(default_factory=time.perf_counter)
+    queries: List[QueryRecord] = field(default_factory=list)
+    service_calls: List[Dict[str, Any]] = field(default_factory=list)
+    timings: Dict[str, float] = field(default_factory=dict)
+    total_ms: Optional[float] = None
+
+    @property
+    def db_ms(self) -> float:
+        return round(sum(query.duration_ms for query in self.queries), 3)
+
+    def add_timing(self, name: str, seconds: float) -> None:
+        self.timings[name] = self.timings.get(name, 0.0) + seconds * 1000
+
+    def server_timing(self) -> str:
+        parts = [f"db;dur={self.db_ms};desc=\"{len(self.queries)} queries\""]
+        for name, duration_ms in self.timings.items():
+            parts.append(f"{name};dur={round(duration_ms, 3)}")
+        if self.total_ms is not None:
+            parts.append(f"total;dur={self.total_ms}")
+        return ', '.join(parts)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'request_id': self.request_id,
+            'method': self.method,
+            'path': self.path,
+            'total_ms': self.total_ms,
+            'db_ms': self.db_ms,
+            'timings': {name: round(duration, 3) for name, duration in self.timings.items()},
+            'queries': [query.to_dict() for query in self.queries],
+            'service_calls': self.service_calls
+        }
+
+
+def current_trace() -> Optional[RequestTrace]:
+    if not has_app_context():
+        return None
+    return g.get('query_trace')
+
+
+def record_timing(name: str, seconds: float) -> None:
+    trace = current_trace()
+    if trace is not None:
+        trace.add_timing(name, seconds)
@@ -0,0 +1,142 @@
+import inspect
+import logging
+from functools import wraps
+from threading import Event, Lock
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
+
+from core.cache import make_cache_key
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+
+class _Call:
+    def __init__(self):
+        self.done = Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    # Collapses concurrent calls that share a key onto one execution: the
+    # first caller runs the function, the others block until it finishes
+    # and receive its result (or its exception). Nothing is kept once the
+    # call completes, so it only dedupes work that overlaps in time.
+    # invalidate() starts a new generation: calls made after a write never
+    # join an execution that may have read the data before it. A
+    # version_source (see LRUCache) does the same for writes made by other
+    # processes.
+
+    def __init__(self, timeout: Optional[float] = 30.0, version_source: Callable[[], Any] = None):
+        self.timeout = timeout
+        self.version_source = version_source
+        self._source_version = None
+        self._calls: Dict[Any, _Call] = {}
+        self._generation = 0
+        self._lock = Lock()
+        self._stats = {
+            'executions': 0,
+            'coalesced': 0,
+            'errors': 0,
+            'timeouts': 0
+        }
+
+    def do(self, key: Any, func: Callable[..., T], *args: Any, **kwargs: Any) -> Tuple[T, bool]:
+        version = self._read_version()
+        with self._lock:
+            if version is not None and version != self._source_version:
+                if self._source_version is not None:
+                    self._generation += 1
+                self._source_version = version
+            key = (self._generation, key)
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._stats['executions'] += 1
+            else:
+                call.waiters += 1
+                self._stats['coalesced'] += 1
+
+        if leader:
+            return self._run(key, call, func, args, kwargs), False
+
+        if not call.done.wait(self.timeout):
+            # A stuck leader must not hold every identical request hostage;
+            # this caller runs the work on its own instead.
+            with self._lock:
+                self._stats['timeouts'] += 1
+            logger.warning(f"Single-flight wait timed out after {self.timeout}s, executing independently")
+            return func(*args, **kwargs), False
+
+        if call.error is not None:
+            raise call.error
+        return call.value, True
+
+    def _read_version(self) -> Any:
+        if self.version_source is None:
+            return None
+        try:
+            return self.version_source()
+        except Exception as e:
+            logger.warning(f"Could not read single-flight version: {e}")
+            return None
+
+    def _run(self, key: Any, call: _Call, func: Callable[..., T], args, kwargs) -> T:
+        try:
+            call.value = func(*args, **kwargs)
+            return call.value
+        except BaseException as e:
+            call.error = e
+            with self._lock:
+                self._stats['errors'] += 1
+            raise
+        finally:
+            # Removed before waking the waiters: a call arriving after this
+            # point starts a fresh execution instead of reusing a finished one.
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._generation += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self._stats,
+                'generation': self._generation,
+                'in_flight': len(self._calls),
+                'waiting': sum(call.waiters for call in self._calls.values())
+            }
+
+
+def single_flight_method(namespace: str, attr: str = 'single_flight', normalize: Callable = None):
+
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @wraps(func)
+        def wrapper(self, *args, **kwargs):
+            flight = getattr(self, attr, None)
+            if flight is None:
+                return func(self, *args, **kwargs)
+
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            arguments = dict(bound.arguments)
+            arguments.pop('self', None)
+            if normalize is not None:
+                arguments = normalize(arguments)
+            key = make_cache_key(namespace, arguments)
+
+            value, shared = flight.do(key, func, self, *args, **kwargs)
+            if shared:
+                logger.debug("Coalesced %s call onto an in-flight execution", namespace)
+            return value
+
+        return wrapper
+    return decorator
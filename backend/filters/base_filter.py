@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Set, Tuple, Type
 
 
 class BaseFilter(ABC):
@@ -27,12 +27,26 @@ class FilterCombiner:
         if self.combiner not in ["AND", "OR"]:
             raise ValueError("Combiner must be 'AND' or 'OR'")
     
-    def build_query(self, filter_values: Dict[str, Any]) -> Tuple[str, List[Any]]:
+    def applied_fields(self, filter_values: Dict[str, Any]) -> Set[str]:
+        # Values a filter rejects (blank text, a query with no searchable
+        # terms) are skipped by build_query and must not be reported either.
+        return {
+            filter_obj.field_name for filter_obj in self.filters
+            if filter_values.get(filter_obj.field_name) is not None
+            and filter_obj.is_valid(filter_values[filter_obj.field_name])
+        }
+    
+    def build_query(
+        self, filter_values: Dict[str, Any], exclude: Tuple[Type[BaseFilter], ...] = ()
+    ) -> Tuple[str, List[Any]]:
         
         conditions = []
         parameters = []
         
         for filter_obj in self.filters:
+            if isinstance(filter_obj, exclude):
+                continue
+            
             field_value = filter_values.get(filter_obj.field_name)
           
             if field_value is None or not filter_obj.is_valid(field_value):
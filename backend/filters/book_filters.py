@@ -1,4 +1,5 @@
-from typing import Any, List, Tuple
+import re
+from typing import Any, List, Optional, Tuple
 from filters.base_filter import BaseFilter
 
 
@@ -27,6 +28,37 @@ class TextFilter(BaseFilter):
         return isinstance(value, str) and len(value.strip()) > 0
 
 
+class FullTextFilter(BaseFilter):
+
+    TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+    def __init__(self, field_name: str, columns: Optional[List[str]] = None, fts_table: str = 'book_fts'):
+        super().__init__(field_name, "MATCH")
+        self.columns = columns if columns is not None else [field_name]
+        self.fts_table = fts_table
+    
+    def match_expression(self, value: Any) -> str:
+        
+        tokens = self.TOKEN_PATTERN.findall(value)
+        terms = " ".join(f'"{token}"*' for token in tokens)
+        
+        if not self.columns:
+            return terms
+        return f"{{{' '.join(self.columns)}}} : ({terms})"
+    
+    def apply(self, value: Any) -> Tuple[str, List[Any]]:
+
+        if not self.is_valid(value):
+            return "", []
+        
+        condition = f"id IN (SELECT rowid FROM {self.fts_table} WHERE {self.fts_table} MATCH ?)"
+        return condition, [self.match_expression(value)]
+    
+    def is_valid(self, value: Any) -> bool:
+        
+        return isinstance(value, str) and bool(self.TOKEN_PATTERN.search(value))
+
+
 class ExactFilter(BaseFilter):
    
     def __init__(self, field_name: str):
@@ -134,4 +166,66 @@ class MultiValueFilter(BaseFilter):
         if isinstance(value, list):
             return len(value) > 0 and any(v is not None for v in value)
         
-        return True 
\ No newline at end of file
+        return True 
+
+
+class SubjectFilter(BaseFilter):
+
+    MODES = ('any', 'all')
+
+    def __init__(self, field_name: str = 'subjects', subject_table: Optional[str] = None):
+        super().__init__(field_name, "IN")
+        self.subject_table = subject_table
+    
+    def _normalize(self, value: Any) -> Tuple[List[str], str]:
+        
+        if isinstance(value, dict):
+            values = value.get('values') or []
+            mode = value.get('mode') or 'any'
+        else:
+            values = value
+            mode = 'any'
+        
+        if isinstance(values, str):
+            values = values.split(',')
+        
+        seen = set()
+        subjects = []
+        for subject in values:
+            if not isinstance(subject, str):
+                continue
+            cleaned = subject.strip()
+            if cleaned and cleaned.lower() not in seen:
+                seen.add(cleaned.lower())
+                subjects.append(cleaned)
+        
+        return subjects, mode
+    
+    def apply(self, value: Any) -> Tuple[str, List[Any]]:
+
+        if not self.is_valid(value):
+            return "", []
+        
+        subjects, mode = self._normalize(value)
+        
+        if self.subject_table:
+            placeholders = ", ".join(["?" for _ in subjects])
+            subquery = f"SELECT book_id FROM {self.subject_table} WHERE subject IN ({placeholders})"
+            if mode == 'all' and len(subjects) > 1:
+                subquery += " GROUP BY book_id HAVING COUNT(*) = ?"
+                return f"id IN ({subquery})", subjects + [len(subjects)]
+            return f"id IN ({subquery})", subjects
+        
+        # Without the subject table, match whole comma-separated entries.
+        member = f"(',' || REPLACE(LOWER({self.field_name}), ', ', ',') || ',') LIKE ?"
+        conditions = [member for _ in subjects]
+        joiner = " AND " if mode == 'all' else " OR "
+        return f"({joiner.join(conditions)})", [f"%,{subject.lower()},%" for subject in subjects]
+    
+    def is_valid(self, value: Any) -> bool:
+        
+        if not isinstance(value, (dict, list)):
+            return False
+        
+        subjects, mode = self._normalize(value)
+        return len(subjects) > 0 and mode in self.MODES
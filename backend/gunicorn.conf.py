@@ -0,0 +1,101 @@
+import shutil
+import tempfile
+
+from config import get_config
+from core.container import container
+from core.logging_config import restart_logging, stop_logging
+from core.metrics import merge_exited_snapshots
+from services.catalog_version import CatalogVersion
+from services.database_service import DatabaseService
+
+# "config" is itself a gunicorn setting name.
+app_config = get_config()
+
+bind = f"{app_config.HOST}:{app_config.PORT}"
+workers = app_config.GUNICORN_WORKERS
+threads = app_config.GUNICORN_THREADS
+worker_class = app_config.GUNICORN_WORKER_CLASS
+keepalive = app_config.GUNICORN_KEEPALIVE
+timeout = app_config.GUNICORN_TIMEOUT
+graceful_timeout = app_config.GUNICORN_GRACEFUL_TIMEOUT
+max_requests = app_config.GUNICORN_MAX_REQUESTS
+max_requests_jitter = app_config.GUNICORN_MAX_REQUESTS_JITTER
+preload_app = app_config.GUNICORN_PRELOAD
+# Uvicorn workers (GUNICORN_WORKER_CLASS=uvicorn.workers.UvicornWorker)
+# serve the ASGI adapter; every other worker class the WSGI app.
+wsgi_app = 'asgi:app' if worker_class.startswith('uvicorn.') else 'app:app'
+
+
+def _shared_catalog_version() -> bool:
+    db_service = DatabaseService(db_path=app_config.DATABASE_PATH)
+    try:
+        return CatalogVersion(db_service).table_enabled
+    finally:
+        db_service.close()
+
+
+# The response cache, count cache and single-flight live in each worker and
+# learn about other workers' writes only through catalog_meta.version.
+if workers > 1 and not _shared_catalog_version():
+    raise RuntimeError(
+        "GUNICORN_WORKERS > 1 needs the catalog_meta table so workers see each other's writes; "
+        "run 'flask --app app catalog-version create' or set GUNICORN_WORKERS=1"
+    )
+
+# Each worker keeps its own metrics, so /metrics only sees all of them
+# through a shared snapshot directory.
+_metrics_dir = None
+if app_config.METRICS_ENABLED and workers > 1 and not app_config.METRICS_DIR:
+    _metrics_dir = app_config.METRICS_DIR = tempfile.mkdtemp(prefix='books-metrics-')
+
+
+def pre_fork(server, worker):
+    # With preload_app the master opened connections while verifying the
+    # app; close them so no SQLite handle crosses the fork.
+    db_service = container.get_existing('database_service')
+    if db_service is not None:
+        db_service.close_idle_connections()
+
+
+def post_fork(server, worker):
+    if not preload_app:
+        return
+
+    restart_logging(app_config)
+
+    db_service = container.get_existing('database_service')
+    if db_service is not None:
+        db_service.reset_after_fork()
+
+    registry = container.get_existing('metrics_registry')
+    if registry is not None:
+        registry.reset_after_fork()
+
+
+def worker_exit(server, worker):
+    registry = container.get_existing('metrics_registry')
+    if registry is not None:
+        registry.stop_flusher()
+        registry.flush(force=True)
+
+    db_service = container.get_existing('database_service')
+    if db_service is not None:
+        db_service.close()
+
+    stop_logging()
+
+
+def child_exit(server, worker):
+    # Runs in the master once the worker is reaped, after its final flush.
+    if app_config.METRICS_DIR:
+        merge_exited_snapshots(app_config.METRICS_DIR, worker.pid)
+
+
+def on_exit(server):
+    if _metrics_dir:
+        # A preloaded master holds a registry too; keep its exit flush out
+        # of the directory being removed.
+        registry = container.get_existing('metrics_registry')
+        if registry is not None:
+            registry.snapshot_dir = None
+        shutil.rmtree(_metrics_dir, ignore_errors=True)
@@ -0,0 +1,194 @@
+import time
+import zlib
+import logging
+from threading import Lock
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from flask import request
+
+from core.cache import LRUCache
+from core.container import container
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+
+# Preferred first when the client accepts several with the same quality.
+ENCODINGS = ['br', 'gzip', 'deflate']
+
+# zlib window bits selecting the gzip or zlib ("deflate" in HTTP) container.
+_WBITS = {'gzip': 31, 'deflate': 15}
+
+
+class ResponseCompressor:
+    def __init__(
+        self,
+        min_size: int = 1024,
+        level: int = 6,
+        mimetypes: Optional[List[str]] = None,
+        cache: Optional[LRUCache] = None
+    ):
+        self.min_size = min_size
+        self.level = level
+        self.mimetypes = set(mimetypes or ['application/json', 'application/x-ndjson', 'text/csv'])
+        self.cache = cache
+        self.encodings = [e for e in ENCODINGS if e != 'br' or brotli is not None]
+        self._lock = Lock()
+        self._stats = {'skipped_small': 0, 'streamed': 0, 'cache_hits': 0}
+        self._encoding_stats = {
+            encoding: {'responses': 0, 'bytes_in': 0, 'bytes_out': 0, 'cpu_ms': 0.0}
+            for encoding in self.encodings
+        }
+
+    def negotiate(self, accept_encodings) -> Optional[str]:
+        best, best_quality = None, 0
+        for encoding in self.encodings:
+            quality = accept_encodings[encoding]
+            if quality > best_quality:
+                best, best_quality = encoding, quality
+        return best
+
+    def _compressor(self, encoding: str):
+        if encoding == 'br':
+            return brotli.Compressor(quality=min(self.level, 11))
+        return zlib.compressobj(self.level, zlib.DEFLATED, _WBITS[encoding])
+
+    def _record(self, encoding: str, bytes_in: int, bytes_out: int, cpu_seconds: float) -> None:
+        with self._lock:
+            stats = self._encoding_stats[encoding]
+            stats['responses'] += 1
+            stats['bytes_in'] += bytes_in
+            stats['bytes_out'] += bytes_out
+            stats['cpu_ms'] += cpu_seconds * 1000
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def compress(self, data: bytes, encoding: str) -> bytes:
+        started = time.process_time()
+        compressor = self._compressor(encoding)
+        if encoding == 'br':
+            compressed = compressor.process(data) + compressor.finish()
+        else:
+            compressed = compressor.compress(data) + compressor.flush()
+        self._record(encoding, len(data), len(compressed), time.process_time() - started)
+        return compressed
+
+    def compress_stream(self, chunks: Iterable[Any], encoding: str) -> Iterator[bytes]:
+        compressor = self._compressor(encoding)
+        bytes_in = bytes_out = 0
+        cpu_seconds = 0.0
+
+        try:
+            for chunk in chunks:
+                if isinstance(chunk, str):
+                    chunk = chunk.encode()
+                started = time.process_time()
+                if encoding == 'br':
+                    # Flush per chunk so clients can decode as rows arrive.
+                    compressed = compressor.process(chunk) + compressor.flush()
+                else:
+                    compressed = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+                cpu_seconds += time.process_time() - started
+                bytes_in += len(chunk)
+                bytes_out += len(compressed)
+                if compressed:
+                    yield compressed
+
+            started = time.process_time()
+            tail = compressor.finish() if encoding == 'br' else compressor.flush()
+            cpu_seconds += time.process_time() - started
+            bytes_out += len(tail)
+            yield tail
+        finally:
+            self._record(encoding, bytes_in, bytes_out, cpu_seconds)
+            if hasattr(chunks, 'close'):
+                chunks.close()
+
+    def process(self, response):
+        if (
+            response.status_code < 200 or response.status_code in (204, 304)
+            or response.mimetype not in self.mimetypes
+            or 'Content-Encoding' in response.headers
+            or response.direct_passthrough
+        ):
+            return response
+
+        response.vary.add('Accept-Encoding')
+        encoding = self.negotiate(request.accept_encodings)
+        if encoding is None:
+            return response
+
+        # HEAD must describe the GET a client would receive: same encoding,
+        # same Content-Length (or none, for streams).
+        if response.is_streamed:
+            self._count('streamed')
+            if request.method == 'HEAD':
+                # Servers still drain the iterable on HEAD; don't export and
+                # compress a whole catalog only to discard it.
+                if hasattr(response.response, 'close'):
+                    response.response.close()
+                response.response = iter(())
+            else:
+                response.response = self.compress_stream(response.response, encoding)
+            response.headers.pop('Content-Length', None)
+            response.headers['Content-Encoding'] = encoding
+            return response
+
+        data = response.get_data()
+        if len(data) < self.min_size:
+            self._count('skipped_small')
+            return response
+
+        # Only responses tagged with a catalog ETag are safe to reuse: the tag
+        # changes whenever their content can.
+        etag, _ = response.get_etag()
+        key = None
+        if self.cache is not None and etag and request.method in ('GET', 'HEAD'):
+            key = (request.full_path, etag, encoding)
+
+        compressed = self.cache.get(key) if key is not None else None
+        if compressed is not None:
+            self._count('cache_hits')
+        else:
+            compressed = self.compress(data, encoding)
+            if key is not None:
+                self.cache.set(key, compressed)
+
+        response.set_data(compressed)
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            encodings = {}
+            for encoding, stats in self._encoding_stats.items():
+                encodings[encoding] = {
+                    **stats,
+                    'cpu_ms': round(stats['cpu_ms'], 2),
+                    'ratio': round(stats['bytes_out'] / stats['bytes_in'], 4) if stats['bytes_in'] else None
+                }
+            return {
+                **self._stats,
+                'min_size': self.min_size,
+                'level': self.level,
+                'encodings': encodings,
+                'cache': self.cache.stats() if self.cache is not None else None
+            }
+
+
+def setup_compression(app):
+    if not app.config.get('COMPRESSION_ENABLED', True):
+        return
+
+    @app.after_request
+    def compress_response(response):
+        try:
+            compressor = container.get('response_compressor')
+        except ValueError:
+            return response
+        return compressor.process(response)
@@ -0,0 +1,58 @@
+import logging
+from flask import request, g
+
+from core.container import container
+
+logger = logging.getLogger(__name__)
+
+
+def setup_conditional_requests(app):
+    cache_control = app.config.get('CACHE_CONTROL', {})
+    conditional_blueprints = set(app.config.get('CONDITIONAL_BLUEPRINTS', []))
+
+    @app.before_request
+    def check_conditional_request():
+        if request.method not in ('GET', 'HEAD') or request.blueprint not in conditional_blueprints:
+            return None
+
+        try:
+            current = container.get('catalog_version').current()
+        except Exception as e:
+            logger.warning(f"Could not read catalog version: {e}")
+            return None
+        if current is None:
+            return None
+
+        version, updated_at = current
+        g.catalog_etag = version
+        g.catalog_updated_at = updated_at
+
+        # If-None-Match wins over If-Modified-Since when both are sent.
+        if request.if_none_match:
+            not_modified = request.if_none_match.contains_weak(version)
+        elif request.if_modified_since:
+            not_modified = int(updated_at) <= request.if_modified_since.timestamp()
+        else:
+            not_modified = False
+
+        if not_modified:
+            return app.response_class(status=304)
+        return None
+
+    @app.after_request
+    def add_cache_headers(response):
+        if request.method not in ('GET', 'HEAD'):
+            return response
+
+        if hasattr(g, 'catalog_etag') and response.status_code in (200, 304):
+            response.set_etag(g.catalog_etag, weak=True)
+            response.last_modified = g.catalog_updated_at
+
+        # Error bodies must not be stored by shared caches under the policy
+        # meant for catalog reads.
+        cacheable = 200 <= response.status_code < 300 or response.status_code == 304
+        policy = cache_control.get(request.blueprint)
+        if cacheable and policy and 'Cache-Control' not in response.headers:
+            response.headers['Cache-Control'] = policy
+
+        return response
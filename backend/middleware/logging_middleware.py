@@ -1,9 +1,11 @@
 import time
 import uuid
 import logging
-from flask import request, g
+from flask import request, g, has_app_context
 from functools import wraps
 
+from core.profiling import current_trace
+
 logger = logging.getLogger(__name__)
 
 
@@ -14,17 +16,21 @@ def setup_request_logging(app):
         g.start_time = time.time()
         g.request_id = str(uuid.uuid4())[:8]
         
-        logger.info(
-            f"[{g.request_id}] {request.method} {request.path} - "
-            f"IP: {request.remote_addr} - "
-            f"User-Agent: {request.headers.get('User-Agent', 'Unknown')}"
-        )
-        
- 
-        if request.method in ['POST', 'PUT'] and request.is_json:
-            safe_data = {k: v for k, v in request.get_json().items() 
-                        if k not in ['password', 'token', 'secret']}
-            logger.debug(f"[{g.request_id}] Request body: {safe_data}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "[%s] %s %s - IP: %s - User-Agent: %s",
+                g.request_id, request.method, request.path, request.remote_addr,
+                request.headers.get('User-Agent', 'Unknown')
+            )
+            
+            if request.method in ['POST', 'PUT'] and request.is_json:
+                body = request.get_json(silent=True)
+                if isinstance(body, dict):
+                    safe_data = {k: v for k, v in body.items() 
+                                if k not in ['password', 'token', 'secret']}
+                    logger.debug("[%s] Request body: %s", g.request_id, safe_data)
+                elif isinstance(body, list):
+                    logger.debug("[%s] Request body: list of %d items", g.request_id, len(body))
     
     @app.after_request
     def after_request(response):
@@ -32,9 +38,9 @@ def setup_request_logging(app):
         if hasattr(g, 'start_time') and hasattr(g, 'request_id'):
             duration = round((time.time() - g.start_time) * 1000, 2)
             
+            # A client error is logged once, with its reason, by the view
+            # that rejected it; the access line for it stays at INFO.
             log_level = logging.INFO
-            if response.status_code >= 400:
-                log_level = logging.WARNING
             if response.status_code >= 500:
                 log_level = logging.ERROR
             if duration > 1000:
@@ -42,9 +48,15 @@ def setup_request_logging(app):
             
             logger.log(
                 log_level,
-                f"[{g.request_id}] {request.method} {request.path} - "
-                f"Status: {response.status_code} - "
-                f"Duration: {duration}ms"
+                "[%s] %s %s - Status: %s - Duration: %sms",
+                g.request_id, request.method, request.path, response.status_code, duration,
+                extra={
+                    'request_id': g.request_id,
+                    'method': request.method,
+                    'path': request.path,
+                    'status': response.status_code,
+                    'duration_ms': duration
+                }
             )
             
             response.headers['X-Request-ID'] = g.request_id
@@ -70,31 +82,43 @@ def log_service_calls(service_name: str):
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
-            start_time = time.time()
-            request_id = getattr(g, 'request_id', 'no-request')
+            start_time = time.perf_counter()
+            request_id = g.get('request_id', 'no-request') if has_app_context() else 'no-request'
             
-            logger.debug(
-                f"[{request_id}] Calling {service_name}.{func.__name__} "
-                f"with args: {args[1:]} kwargs: {kwargs}"
-            )
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "[%s] Calling %s.%s with args: %s kwargs: %s",
+                    request_id, service_name, func.__name__, args[1:], kwargs
+                )
             
             try:
                 result = func(*args, **kwargs)
-                duration = round((time.time() - start_time) * 1000, 2)
+                duration = round((time.perf_counter() - start_time) * 1000, 2)
                 
                 logger.debug(
-                    f"[{request_id}] {service_name}.{func.__name__} "
-                    f"completed in {duration}ms"
+                    "[%s] %s.%s completed in %sms",
+                    request_id, service_name, func.__name__, duration
                 )
                 
+                trace = current_trace()
+                if trace is not None:
+                    trace.service_calls.append({
+                        'name': f"{service_name}.{func.__name__}",
+                        'duration_ms': duration
+                    })
+                
                 return result
             except Exception as e:
-                duration = round((time.time() - start_time) * 1000, 2)
-                logger.error(
-                    f"[{request_id}] {service_name}.{func.__name__} "
-                    f"failed after {duration}ms: {e}"
+                duration = round((time.perf_counter() - start_time) * 1000, 2)
+                # ValueError is how services reject client input (a 400),
+                # which the view logs at WARNING; ERROR is kept for failures
+                # nobody asked for.
+                logger.log(
+                    logging.DEBUG if isinstance(e, ValueError) else logging.ERROR,
+                    "[%s] %s.%s failed after %sms: %s",
+                    request_id, service_name, func.__name__, duration, e
                 )
                 raise
         
         return wrapper
-    return decorator 
\ No newline at end of file
+    return decorator
@@ -0,0 +1,73 @@
+import time
+import logging
+from flask import request, g
+
+from core.container import container
+from core.metrics import MetricsRegistry, LATENCY_BUCKETS
+
+logger = logging.getLogger(__name__)
+
+
+def define_metrics(registry: MetricsRegistry) -> None:
+    registry.histogram('http_request_duration_seconds', 'Request latency by route', LATENCY_BUCKETS)
+    registry.counter('http_requests_total', 'Requests by route, method and status')
+    registry.gauge('http_requests_in_flight', 'Requests currently being handled')
+    registry.gauge('db_pool_connections', 'Pooled connections by pool and state')
+    registry.counter('db_pool_events_total', 'Pool events by pool and event')
+    registry.counter('cache_events_total', 'Cache events by cache and event')
+    registry.gauge('cache_entries', 'Entries held in each cache')
+    registry.counter('single_flight_events_total', 'Single-flight book list events')
+    registry.gauge('single_flight_in_flight', 'Shared book list executions and their waiters')
+
+
+def collect_service_metrics(registry: MetricsRegistry) -> None:
+    for pool_name, stats in container.get('database_service').get_pool_stats().items():
+        for state in ('in_use', 'idle', 'size'):
+            registry.set_gauge('db_pool_connections', stats[state], pool=pool_name, state=state)
+        for event in ('checkouts', 'created', 'timeouts', 'validation_failures'):
+            registry.set_counter('db_pool_events_total', stats[event], pool=pool_name, event=event)
+
+    for cache_name, stats in container.get('book_service').get_cache_stats().items():
+        if stats is None:
+            continue
+        registry.set_gauge('cache_entries', stats['entries'], cache=cache_name)
+        for event in ('hits', 'stale_hits', 'misses', 'evictions', 'invalidations'):
+            registry.set_counter('cache_events_total', stats[event], cache=cache_name, event=event)
+
+    flight_stats = container.get('book_service').get_single_flight_stats()
+    if flight_stats is not None:
+        for event in ('executions', 'coalesced', 'errors', 'timeouts'):
+            registry.set_counter('single_flight_events_total', flight_stats[event], event=event)
+        for state in ('in_flight', 'waiting'):
+            registry.set_gauge('single_flight_in_flight', flight_stats[state], state=state)
+
+
+def setup_metrics(app):
+    if not app.config.get('METRICS_ENABLED', True):
+        return
+
+    @app.before_request
+    def start_request_metrics():
+        g.metrics_started = time.perf_counter()
+        container.get('metrics_registry').add_gauge('http_requests_in_flight', 1)
+
+    @app.after_request
+    def record_request_metrics(response):
+        if not hasattr(g, 'metrics_started'):
+            return response
+
+        registry = container.get('metrics_registry')
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        registry.observe(
+            'http_request_duration_seconds', time.perf_counter() - g.metrics_started,
+            method=request.method, route=route
+        )
+        registry.inc('http_requests_total', method=request.method, route=route, status=response.status_code)
+        return response
+
+    @app.teardown_request
+    def finish_request_metrics(error=None):
+        if hasattr(g, 'metrics_started'):
+            registry = container.get('metrics_registry')
+            registry.add_gauge('http_requests_in_flight', -1)
+            registry.flush()
@@ -0,0 +1,33 @@
+import logging
+from flask import request, g
+
+from core.container import container
+
+logger = logging.getLogger(__name__)
+
+
+def setup_profiling(app):
+    if app.config.get('PROFILER_MODE', 'off') == 'off' and not app.config.get('SLOW_QUERY_MS'):
+        return
+
+    @app.before_request
+    def start_profile():
+        # Resolving the profiler also attaches its query listener, which the
+        # slow-query log needs even when no request is traced.
+        profiler = container.get('query_profiler')
+        if profiler.should_profile(request.headers):
+            profiler.start(g.get('request_id', 'no-request'), request.method, request.path)
+
+    @app.after_request
+    def finish_profile(response):
+        trace = g.pop('query_trace', None)
+        if trace is None:
+            return response
+
+        container.get('query_profiler').finish(trace)
+        response.headers['Server-Timing'] = trace.server_timing()
+        logger.debug(
+            "[%s] Profiled %s %s: %d queries, db %sms, total %sms",
+            trace.request_id, trace.method, trace.path, len(trace.queries), trace.db_ms, trace.total_ms
+        )
+        return response
@@ -1,5 +1,76 @@
 from dataclasses import dataclass
-from typing import Optional, Dict, Any
+from functools import lru_cache
+from operator import itemgetter
+from typing import Optional, Dict, Any, List, Sequence, Tuple
+
+
+BOOK_FIELD_COLUMNS: Dict[str, str] = {
+    'id': 'id',
+    'title': 'title',
+    'author': 'author',
+    'author_id': 'author_id',
+    'biography': 'author_bio',
+    'authors': 'authors',
+    'title_slug': 'title_slug',
+    'author_slug': 'author_slug',
+    'isbn13': 'isbn13',
+    'isbn10': 'isbn10',
+    'price': 'price',
+    'format': 'format',
+    'publisher': 'publisher',
+    'pubdate': 'pubdate',
+    'edition': 'edition',
+    'subjects': 'subjects',
+    'lexile': 'lexile',
+    'pages': 'pages',
+    'dimensions': 'dimensions',
+    'overview': 'overview',
+    'excerpt': 'excerpt',
+    'synopsis': 'synopsis',
+    'toc': 'toc',
+    'editorial_reviews': 'editorial_reviews'
+}
+
+BOOK_FIELD_PRESETS: Dict[str, List[str]] = {
+    'summary': [
+        'id', 'title', 'author', 'title_slug', 'author_slug', 'isbn13',
+        'price', 'format', 'publisher', 'pubdate', 'subjects', 'pages'
+    ],
+    'full': list(BOOK_FIELD_COLUMNS)
+}
+
+
+class BookRowMapper:
+    __slots__ = ('keys', 'indices', 'positional', '_getter')
+
+    def __init__(self, columns: Sequence[str], fields: Optional[Sequence[str]] = None):
+        positions = {column: index for index, column in enumerate(columns)}
+        keys = tuple(fields) if fields is not None else tuple(BOOK_FIELD_COLUMNS)
+
+        try:
+            indices = tuple(positions[BOOK_FIELD_COLUMNS[field]] for field in keys)
+        except KeyError as e:
+            raise ValueError(f"Missing column for Book field: {e.args[0]}")
+
+        self.keys = keys
+        self.indices = indices
+        # SELECT * on book already yields the columns in output order.
+        self.positional = indices == tuple(range(len(columns)))
+        if len(indices) == 1:
+            index = indices[0]
+            self._getter = lambda row: (row[index],)
+        else:
+            self._getter = itemgetter(*indices)
+
+    def to_dict(self, row) -> Dict[str, Any]:
+        if self.positional:
+            return dict(zip(self.keys, row))
+        return dict(zip(self.keys, self._getter(row)))
+
+
+@lru_cache(maxsize=128)
+def get_book_row_mapper(columns: Tuple[str, ...], fields: Optional[Tuple[str, ...]] = None) -> BookRowMapper:
+    return BookRowMapper(columns, fields)
 
 
 @dataclass
@@ -57,6 +128,27 @@ class Book:
             'editorial_reviews': self.editorial_reviews
         }
 
+    @classmethod
+    def resolve_fields(cls, fields: Optional[str]) -> Optional[List[str]]:
+        if not fields or not fields.strip():
+            return None
+        
+        selected = set()
+        for name in fields.split(','):
+            name = name.strip()
+            if not name:
+                continue
+            if name in BOOK_FIELD_PRESETS:
+                selected.update(BOOK_FIELD_PRESETS[name])
+            elif name in BOOK_FIELD_COLUMNS:
+                selected.add(name)
+            else:
+                raise ValueError(f"Unknown field: {name}")
+        
+        if not selected or selected == set(BOOK_FIELD_COLUMNS):
+            return None
+        return [field for field in BOOK_FIELD_COLUMNS if field in selected]
+
     @classmethod
     def from_db_row(cls, row: tuple) -> 'Book':
         if not row or len(row) < 24:
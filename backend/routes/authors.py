@@ -16,7 +16,7 @@ def get_authors():
     try:
         book_service = get_book_service()
         authors = book_service.get_authors()
-        logger.info(f"Authors retrieved: {len(authors)} items")
+        logger.info("Authors retrieved: %s items", len(authors))
         return jsonify(authors)
         
     except Exception as e:
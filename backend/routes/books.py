@@ -1,6 +1,11 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, jsonify, request, current_app
+import io
+import csv
+import json
 import logging
+from typing import Any, Dict
 from core.container import container
+from models.book import Book, BOOK_FIELD_COLUMNS
 
 logger = logging.getLogger(__name__)
 
@@ -11,67 +16,167 @@ def get_book_service():
     return container.get('book_service')
 
 
+def parse_book_filters(args, format_param: str = 'format') -> Dict[str, Any]:
+    filters = {}
+    
+    text_filters = ['q', 'title', 'author', 'publisher', 'subjects', 'synopsis', 'overview', 'excerpt']
+    for filter_name in text_filters:
+        value = args.get(filter_name)
+        if value:
+            filters[filter_name] = value
+    
+    subjects_mode = args.get('subjects_mode')
+    subjects = args.get('subjects')
+    if subjects and (subjects_mode or ',' in subjects):
+        if (subjects_mode or 'any') not in ('any', 'all'):
+            raise ValueError("subjects_mode must be 'any' or 'all'")
+        filters['subjects'] = {
+            'values': [s.strip() for s in subjects.split(',') if s.strip()],
+            'mode': subjects_mode or 'any'
+        }
+    
+    exact_filters = {'format': format_param, 'edition': 'edition', 'author_slug': 'author_slug'}
+    for filter_name, param in exact_filters.items():
+        value = args.get(param)
+        if value:
+            filters[filter_name] = value
+    
+    pages_min = args.get('pages_min', type=int)
+    pages_max = args.get('pages_max', type=int)
+    if pages_min is not None or pages_max is not None:
+        filters['pages'] = {}
+        if pages_min is not None:
+            filters['pages']['min'] = pages_min
+        if pages_max is not None:
+            filters['pages']['max'] = pages_max
+    
+    return filters
+
+
+def parse_list_args(args) -> Dict[str, Any]:
+    page = args.get('page', default=1, type=int)
+    page_size = min(args.get('page_size', default=10, type=int), 100)
+    
+    count_mode = args.get('count_mode', 'exact')
+    if args.get('include_total', '').lower() == 'false':
+        count_mode = 'none'
+    
+    filters = parse_book_filters(args)
+    
+    if page < 1:
+        raise ValueError("Page must be >= 1")
+    if page_size < 1:
+        raise ValueError("Page size must be >= 1")
+    
+    return {
+        'filters': filters,
+        'page': page,
+        'page_size': page_size,
+        'order_by': args.get('order_by'),
+        'order_direction': args.get('order_direction', 'ASC'),
+        'cursor': args.get('cursor'),
+        'count_mode': count_mode,
+        'fields': args.get('fields')
+    }
+
+
 @books_bp.route('/books', methods=['GET'])
 def get_books():
     try:
         book_service = get_book_service()
         
-        page = request.args.get('page', default=1, type=int)
-        page_size = min(request.args.get('page_size', default=10, type=int), 100)
-        
-        order_by = request.args.get('order_by')
-        order_direction = request.args.get('order_direction', 'ASC')
+        list_args = parse_list_args(request.args)
+        result = book_service.get_books_with_filters(**list_args)
         
-        filters = {}
-        
-        text_filters = ['title', 'author', 'publisher', 'subjects', 'synopsis', 'overview', 'excerpt']
-        for filter_name in text_filters:
-            value = request.args.get(filter_name)
-            if value:
-                filters[filter_name] = value
-        
-        exact_filters = ['format', 'edition', 'author_slug']
-        for filter_name in exact_filters:
-            value = request.args.get(filter_name)
-            if value:
-                filters[filter_name] = value
+        logger.info("Books retrieved: %s items, page %s", len(result['books']), list_args['page'])
+        return jsonify(result)
         
-        pages_min = request.args.get('pages_min', type=int)
-        pages_max = request.args.get('pages_max', type=int)
-        if pages_min is not None or pages_max is not None:
-            filters['pages'] = {}
-            if pages_min is not None:
-                filters['pages']['min'] = pages_min
-            if pages_max is not None:
-                filters['pages']['max'] = pages_max
+    except ValueError as e:
+        logger.warning("Invalid request parameters: %s", e)
+        return jsonify({
+            'error': 'Invalid parameters',
+            'message': str(e)
+        }), 400
+    except Exception as e:
+        logger.error(f"Error in get_books: {e}")
+        return jsonify({
+            'error': 'Internal server error',
+            'message': 'Failed to retrieve books'
+        }), 500
+
+
+def iter_ndjson(books, chunk_size: int):
+    buffer = []
+    for book in books:
+        buffer.append(json.dumps(book, separators=(',', ':'), default=str))
+        if len(buffer) >= chunk_size:
+            yield '\n'.join(buffer) + '\n'
+            buffer = []
+    if buffer:
+        yield '\n'.join(buffer) + '\n'
+
+
+def iter_csv(books, columns, chunk_size: int):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction='ignore')
+    writer.writeheader()
+    
+    for index, book in enumerate(books, start=1):
+        writer.writerow(book)
+        if index % chunk_size == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+@books_bp.route('/books/export', methods=['GET'])
+def export_books():
+    try:
+        export_format = request.args.get('format', 'ndjson').lower()
+        if export_format not in ('ndjson', 'csv'):
+            raise ValueError("format must be 'ndjson' or 'csv'")
         
-        if page < 1:
-            raise ValueError("Page must be >= 1")
-        if page_size < 1:
-            raise ValueError("Page size must be >= 1")
+        fields = request.args.get('fields')
+        columns = Book.resolve_fields(fields) or list(BOOK_FIELD_COLUMNS)
+        chunk_size = current_app.config['EXPORT_CHUNK_SIZE']
         
-        result = book_service.get_books_with_filters(
-            filters=filters,
-            page=page,
-            page_size=page_size,
-            order_by=order_by,
-            order_direction=order_direction
+        book_service = get_book_service()
+        books = book_service.iter_books_with_filters(
+            # 'format' selects the export encoding here, so the book format
+            # filter is read from 'book_format' instead.
+            filters=parse_book_filters(request.args, format_param='book_format'),
+            order_by=request.args.get('order_by'),
+            order_direction=request.args.get('order_direction', 'ASC'),
+            fields=fields,
+            chunk_size=chunk_size
         )
         
-        logger.info(f"Books retrieved: {len(result['books'])} items, page {page}")
-        return jsonify(result)
+        if export_format == 'csv':
+            body = iter_csv(books, columns, chunk_size)
+            mimetype = 'text/csv'
+        else:
+            body = iter_ndjson(books, chunk_size)
+            mimetype = 'application/x-ndjson'
+        
+        logger.info("Streaming book export as %s", export_format)
+        response = Response(body, mimetype=mimetype)
+        response.headers['Content-Disposition'] = f'attachment; filename="books.{export_format}"'
+        return response
         
     except ValueError as e:
-        logger.warning(f"Invalid request parameters: {e}")
+        logger.warning("Invalid export parameters: %s", e)
         return jsonify({
             'error': 'Invalid parameters',
             'message': str(e)
         }), 400
     except Exception as e:
-        logger.error(f"Error in get_books: {e}")
+        logger.error(f"Error exporting books: {e}")
         return jsonify({
             'error': 'Internal server error',
-            'message': 'Failed to retrieve books'
+            'message': 'Failed to export books'
         }), 500
 
 
@@ -79,7 +184,7 @@ def get_books():
 def get_book(book_id: int):
     try:
         book_service = get_book_service()
-        book = book_service.get_book_by_id(book_id)
+        book = book_service.get_book_by_id(book_id, fields=request.args.get('fields'))
         
         if not book:
             return jsonify({
@@ -87,9 +192,15 @@ def get_book(book_id: int):
                 'message': f'Book with ID {book_id} not found'
             }), 404
         
-        logger.info(f"Book retrieved: ID {book_id}")
+        logger.info("Book retrieved: ID %s", book_id)
         return jsonify(book)
         
+    except ValueError as e:
+        logger.warning("Invalid request parameters: %s", e)
+        return jsonify({
+            'error': 'Invalid parameters',
+            'message': str(e)
+        }), 400
     except Exception as e:
         logger.error(f"Error getting book {book_id}: {e}")
         return jsonify({
@@ -111,14 +222,14 @@ def create_book():
         book_service = get_book_service()
         created_book = book_service.create_book(book_data)
         
-        logger.info(f"Book created: ID {created_book.get('id')}")
+        logger.info("Book created: ID %s", created_book.get('id'))
         return jsonify({
             'message': 'Book created successfully',
             'book': created_book
         }), 201
         
     except ValueError as e:
-        logger.warning(f"Invalid book data: {e}")
+        logger.warning("Invalid book data: %s", e)
         return jsonify({
             'error': 'Invalid data',
             'message': str(e)
@@ -131,6 +242,52 @@ def create_book():
         }), 500
 
 
+def parse_ndjson(stream):
+    for line_number, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as e:
+            yield ValueError(f"Invalid JSON on line {line_number}: {e}")
+
+
+@books_bp.route('/books/bulk', methods=['POST'])
+def bulk_upsert_books():
+    try:
+        batch_size = request.args.get('batch_size', default=current_app.config['BULK_BATCH_SIZE'], type=int)
+        batch_size = min(max(batch_size, 1), current_app.config['BULK_MAX_BATCH_SIZE'])
+        
+        if request.mimetype in ('application/x-ndjson', 'application/jsonl'):
+            items = parse_ndjson(request.stream)
+        elif request.is_json:
+            items = request.get_json()
+            if not isinstance(items, list):
+                raise ValueError("Request body must be a JSON array of books")
+        else:
+            raise ValueError("Request must be a JSON array or NDJSON")
+        
+        book_service = get_book_service()
+        result = book_service.bulk_upsert_books(items, batch_size=batch_size)
+        
+        logger.info("Bulk upsert processed %s items", result['stats']['received'])
+        return jsonify(result), 200
+        
+    except ValueError as e:
+        logger.warning("Invalid bulk data: %s", e)
+        return jsonify({
+            'error': 'Invalid data',
+            'message': str(e)
+        }), 400
+    except Exception as e:
+        logger.error(f"Error in bulk upsert: {e}")
+        return jsonify({
+            'error': 'Internal server error',
+            'message': 'Failed to import books'
+        }), 500
+
+
 @books_bp.route('/books/<int:book_id>', methods=['PUT'])
 def update_book(book_id: int):
     try:
@@ -150,14 +307,14 @@ def update_book(book_id: int):
                 'message': f'Book with ID {book_id} not found'
             }), 404
         
-        logger.info(f"Book updated: ID {book_id}")
+        logger.info("Book updated: ID %s", book_id)
         return jsonify({
             'message': 'Book updated successfully',
             'book': updated_book
         }), 200
         
     except ValueError as e:
-        logger.warning(f"Invalid book data: {e}")
+        logger.warning("Invalid book data: %s", e)
         return jsonify({
             'error': 'Invalid data',
             'message': str(e)
@@ -182,7 +339,7 @@ def delete_book(book_id: int):
                 'message': f'Book with ID {book_id} not found'
             }), 404
         
-        logger.info(f"Book deleted: ID {book_id}")
+        logger.info("Book deleted: ID %s", book_id)
         return jsonify({
             'message': 'Book deleted successfully'
         }), 200
@@ -199,8 +356,11 @@ def delete_book(book_id: int):
 def get_subjects():
     try:
         book_service = get_book_service()
-        subjects = book_service.get_available_subjects()
-        logger.info(f"Subjects retrieved: {len(subjects)} items")
+        if request.args.get('with_counts', '').lower() == 'true':
+            subjects = book_service.get_subject_counts()
+        else:
+            subjects = book_service.get_available_subjects()
+        logger.info("Subjects retrieved: %s items", len(subjects))
         return jsonify(subjects)
         
     except Exception as e:
@@ -216,7 +376,7 @@ def get_publishers():
     try:
         book_service = get_book_service()
         publishers = book_service.get_available_publishers()
-        logger.info(f"Publishers retrieved: {len(publishers)} items")
+        logger.info("Publishers retrieved: %s items", len(publishers))
         return jsonify(publishers)
         
     except Exception as e:
@@ -232,10 +392,20 @@ def get_books_by_author(author_slug: str):
     try:
         book_service = get_book_service()
         filters = {'author_slug': author_slug}
-        result = book_service.get_books_with_filters(filters=filters, page_size=100)
+        result = book_service.get_books_with_filters(
+            filters=filters,
+            page_size=100,
+            fields=request.args.get('fields')
+        )
         
         return jsonify(result['books'])
         
+    except ValueError as e:
+        logger.warning("Invalid request parameters: %s", e)
+        return jsonify({
+            'error': 'Invalid parameters',
+            'message': str(e)
+        }), 400
     except Exception as e:
         logger.error(f"Error getting books by author {author_slug}: {e}")
         return jsonify({
@@ -248,10 +418,20 @@ def get_books_by_author(author_slug: str):
 def get_books_by_subject(subject: str):
     try:
         book_service = get_book_service()
-        filters = {'subjects': subject}
-        result = book_service.get_books_with_filters(filters=filters, page_size=100)
+        filters = {'subjects': {'values': [subject], 'mode': 'any'}}
+        result = book_service.get_books_with_filters(
+            filters=filters,
+            page_size=100,
+            fields=request.args.get('fields')
+        )
         return jsonify(result['books'])
         
+    except ValueError as e:
+        logger.warning("Invalid request parameters: %s", e)
+        return jsonify({
+            'error': 'Invalid parameters',
+            'message': str(e)
+        }), 400
     except Exception as e:
         logger.error(f"Error getting books by subject {subject}: {e}")
         return jsonify({
@@ -44,7 +44,8 @@ def detailed_health_check():
         health_status['checks']['database'] = {
             'status': 'healthy',
             'response_time_ms': round(db_time * 1000, 2),
-            'message': 'Database connection successful'
+            'message': 'Database connection successful',
+            'pool': db_service.get_pool_stats()
         }
         
         book_service = container.get('book_service')
@@ -55,9 +56,12 @@ def detailed_health_check():
         health_status['checks']['book_service'] = {
             'status': 'healthy',
             'response_time_ms': round(service_time * 1000, 2),
-            'message': 'Book service operational'
+            'message': 'Book service operational',
+            'cache': book_service.get_cache_stats()
         }
         
+        health_status['checks']['compression'] = container.get('response_compressor').stats()
+        
         total_time = time.time() - start_time
         health_status['response_time_ms'] = round(total_time * 1000, 2)
         
@@ -0,0 +1,30 @@
+from flask import Blueprint, Response, jsonify
+import logging
+from core.container import container
+
+logger = logging.getLogger(__name__)
+
+metrics_bp = Blueprint('metrics', __name__)
+
+
+@metrics_bp.route("/metrics", methods=["GET"])
+def metrics():
+    try:
+        body = container.get('metrics_registry').render()
+        return Response(body, mimetype='text/plain; version=0.0.4')
+    except Exception:
+        logger.exception("Error rendering metrics")
+        return Response("# metrics unavailable\n", status=500, mimetype='text/plain')
+
+
+@metrics_bp.route("/debug/profile/<request_id>", methods=["GET"])
+def get_profile(request_id: str):
+    profiler = container.get('query_profiler')
+    trace = profiler.get_trace(request_id) if profiler.mode != 'off' else None
+    if trace is None:
+        return jsonify({
+            'error': 'Profile not found',
+            'message': f'No profile recorded for request {request_id}'
+        }), 404
+    
+    return jsonify(trace.to_dict())
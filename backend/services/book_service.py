@@ -1,121 +1,512 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Iterable, Iterator
+import time
+from concurrent.futures import Executor, TimeoutError as FutureTimeoutError
+import sqlite3
 import logging
 
-from models.book import Book
+from models.book import Book, BOOK_FIELD_COLUMNS, get_book_row_mapper
 from models.author import Author
 from services.database_service import DatabaseService
+from services.search_index_service import SearchIndexService, FTS_TABLE
+from services.count_cache import CountCache
+from services.subject_catalog import SubjectCatalog, SUBJECT_TABLE
+from services.catalog_version import CatalogVersion
+from core.cache import LRUCache, cached_method
+from core.executor import submit
+from core.single_flight import SingleFlight, single_flight_method
+from middleware.logging_middleware import log_service_calls
+from services.schema_service import QueryPlanGuard
+from services.cursor_pagination import encode_cursor, decode_cursor, keyset_segments
 from filters.base_filter import FilterCombiner
-from filters.book_filters import TextFilter, ExactFilter, NumericRangeFilter, MultiValueFilter
+from filters.book_filters import (
+    TextFilter, FullTextFilter, ExactFilter, NumericRangeFilter, MultiValueFilter, SubjectFilter
+)
 
 logger = logging.getLogger(__name__)
 
 
+WRITABLE_FIELDS = {
+    'title': 'title',
+    'author': 'author',
+    'author_bio': 'author_bio',
+    'authors': 'authors',
+    'author_slug': 'author_slug',
+    'publisher': 'publisher',
+    'synopsis': 'synopsis',
+    'subjects': 'subjects',
+    'isbn13': 'isbn13',
+    'isbn10': 'isbn10',
+    'price': 'price',
+    'format': 'format',
+    'pages': 'pages',
+    'overview': 'overview',
+    'excerpt': 'excerpt'
+}
+
+SQLITE_INT_MIN = -2 ** 63
+SQLITE_INT_MAX = 2 ** 63 - 1
+
+
+def _list_flight_arguments(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    # Unset query parameters arrive as None filters; they do not change the
+    # result, so they must not split otherwise identical requests.
+    filters = arguments.get('filters') or {}
+    return {**arguments, 'filters': {k: v for k, v in filters.items() if v is not None}}
+
+
 class BookService:
-    def __init__(self, db_service: DatabaseService = None):
+    COUNT_MODES = ('exact', 'estimated', 'none')
+    LIST_QUERY_MODES = ('sequential', 'concurrent', 'window')
+    WINDOW_COUNT_COLUMN = 'window_total_count'
+    
+    def __init__(
+        self,
+        db_service: DatabaseService = None,
+        search_index: SearchIndexService = None,
+        count_cache: CountCache = None,
+        count_estimate_cap: int = 10000,
+        query_plan_guard: QueryPlanGuard = None,
+        response_cache: LRUCache = None,
+        subject_catalog: SubjectCatalog = None,
+        catalog_version: CatalogVersion = None,
+        list_query_mode: str = 'sequential',
+        query_executor: Executor = None,
+        list_query_timeout: float = 10.0,
+        single_flight: SingleFlight = None
+    ):
+        if list_query_mode not in self.LIST_QUERY_MODES:
+            raise ValueError(f"list_query_mode must be one of: {', '.join(self.LIST_QUERY_MODES)}")
+        if list_query_mode == 'concurrent' and query_executor is None:
+            raise ValueError("Concurrent list queries need a query executor")
+        
         self.db_service = db_service or DatabaseService()
+        self.search_index = search_index or SearchIndexService(self.db_service)
+        self.count_cache = count_cache or CountCache()
+        self.count_estimate_cap = count_estimate_cap
+        self.query_plan_guard = query_plan_guard
+        self.response_cache = response_cache
+        self.subject_catalog = subject_catalog or SubjectCatalog(self.db_service)
+        self.subject_catalog_enabled = self.subject_catalog.is_available()
+        self.catalog_version = catalog_version or CatalogVersion(self.db_service)
+        self.list_query_mode = list_query_mode
+        self.query_executor = query_executor
+        self.list_query_timeout = list_query_timeout
+        self.single_flight = single_flight
         self._initialize_filters()
     
     def _initialize_filters(self):
-        self.available_filters = [
-            TextFilter('title', case_sensitive=False),
-            TextFilter('author', case_sensitive=False),
+        self.full_text_enabled = self.search_index.is_available()
+        
+        if self.full_text_enabled:
+            text_search_filters = [
+                FullTextFilter('title', fts_table=FTS_TABLE),
+                FullTextFilter('author', fts_table=FTS_TABLE),
+                FullTextFilter('synopsis', fts_table=FTS_TABLE),
+                FullTextFilter('subjects', fts_table=FTS_TABLE),
+                FullTextFilter('overview', fts_table=FTS_TABLE),
+                FullTextFilter('excerpt', fts_table=FTS_TABLE),
+                FullTextFilter('q', columns=[], fts_table=FTS_TABLE),
+            ]
+        else:
+            logger.warning(f"Full-text index {FTS_TABLE} not found, falling back to LIKE text filters")
+            text_search_filters = [
+                TextFilter('title', case_sensitive=False),
+                TextFilter('author', case_sensitive=False),
+                TextFilter('synopsis', case_sensitive=False),
+                TextFilter('subjects', case_sensitive=False),
+                TextFilter('overview', case_sensitive=False),
+                TextFilter('excerpt', case_sensitive=False),
+            ]
+        
+        self.available_filters = text_search_filters + [
             TextFilter('author_bio', case_sensitive=False),
             TextFilter('authors', case_sensitive=False),
             TextFilter('publisher', case_sensitive=False),
-            TextFilter('synopsis', case_sensitive=False),
-            TextFilter('subjects', case_sensitive=False),
-            TextFilter('overview', case_sensitive=False),
-            TextFilter('excerpt', case_sensitive=False),
             ExactFilter('author_slug'),
             ExactFilter('format'),
             ExactFilter('edition'),
             NumericRangeFilter('pages'),
             NumericRangeFilter('isbn13'),
-            MultiValueFilter('subjects'),
+            SubjectFilter('subjects', subject_table=SUBJECT_TABLE if self.subject_catalog_enabled else None),
             MultiValueFilter('format'),
         ]
         
         self.filter_combiner = FilterCombiner(self.available_filters, combiner="AND")
     
+    @log_service_calls('BookService')
+    @cached_method('books')
+    @single_flight_method('books', normalize=_list_flight_arguments)
     def get_books_with_filters(
         self, 
         filters: Dict[str, Any] = None, 
         page: int = 1, 
         page_size: int = 10,
         order_by: str = None,
-        order_direction: str = 'ASC'
+        order_direction: str = 'ASC',
+        cursor: str = None,
+        count_mode: str = 'exact',
+        fields: str = None
     ) -> Dict[str, Any]:
         
         if filters is None:
             filters = {}
         
+        if count_mode not in self.COUNT_MODES:
+            raise ValueError(f"count_mode must be one of: {', '.join(self.COUNT_MODES)}")
+        
         try:
+            projection = Book.resolve_fields(fields)
             where_clause, parameters = self.filter_combiner.build_query(filters)
             
-            base_query = "SELECT * FROM book"
-            
-            if where_clause:
-                base_query += where_clause
-            
-            if order_by and self._is_valid_column(order_by):
-                direction = 'DESC' if order_direction.upper() == 'DESC' else 'ASC'
-                base_query += f" ORDER BY {order_by} {direction}"
+            direction = 'DESC' if order_direction.upper() == 'DESC' else 'ASC'
+            sort_column = None
+            if order_by != 'relevance':
+                sort_column = order_by if order_by and self._is_valid_column(order_by) else 'id'
+            
+            cursor_payload = None
+            if cursor:
+                if sort_column is None:
+                    raise ValueError("Cursor pagination is not supported with relevance ordering")
+                cursor_payload = decode_cursor(cursor, sort_column, direction)
+            backward = bool(cursor_payload and cursor_payload.get('r'))
+            
+            select_columns = self._select_columns(projection, sort_column)
+            match_expression = self._build_match_expression(filters) if sort_column is None else None
+            if match_expression:
+                # FTS5 rank is bm25(); lower values are better matches. The
+                # join both ranks and restricts the page to the matches, so
+                # the full-text predicates stay out of its WHERE clause and
+                # FTS runs a single MATCH.
+                if select_columns == '*':
+                    select_columns = 'book.*'
+                base_query = (
+                    f" FROM book JOIN (SELECT rowid AS match_rowid, rank AS match_rank FROM {FTS_TABLE}"
+                    f" WHERE {FTS_TABLE} MATCH ?) AS ranked ON ranked.match_rowid = book.id"
+                )
+                page_where_clause, page_parameters = self.filter_combiner.build_query(
+                    filters, exclude=(FullTextFilter,)
+                )
+                page_parameters = [match_expression] + page_parameters
+            else:
+                base_query = " FROM book"
+                page_where_clause = where_clause
+                page_parameters = list(parameters)
+            
+            if cursor_payload:
+                # A backward cursor walks the reversed ordering; rows are
+                # flipped back after fetching.
+                seek_direction = ('ASC' if direction == 'DESC' else 'DESC') if backward else direction
+                segments = keyset_segments(sort_column, seek_direction, cursor_payload['v'], cursor_payload['id'])
+            else:
+                seek_direction = direction
+                segments = [(None, [])]
             
-            count_query = f"SELECT COUNT(*) FROM book{where_clause}"
-            count_result = self.db_service.execute_query(count_query, parameters)
-            total_count = count_result[0][0] if count_result else 0
+            if sort_column is None:
+                order_clause = f" ORDER BY ranked.match_rank {direction}" if match_expression else ""
+            elif sort_column == 'id':
+                order_clause = f" ORDER BY id {seek_direction}"
+            else:
+                order_clause = f" ORDER BY {sort_column} {seek_direction}, id {seek_direction}"
             
-            offset = (page - 1) * page_size
-            paginated_query = base_query + f" LIMIT {page_size} OFFSET {offset}"
+            if cursor_payload:
+                limit_clause = f" LIMIT {page_size + 1}"
+            else:
+                offset = (page - 1) * page_size
+                limit_clause = f" LIMIT {page_size + 1} OFFSET {offset}"
+            
+            page_queries = []
+            for condition, condition_params in segments:
+                segment_where_clause = page_where_clause
+                if condition:
+                    segment_where_clause += f" AND {condition}" if page_where_clause else f" WHERE {condition}"
+                page_queries.append((
+                    f"SELECT {select_columns}{base_query}{segment_where_clause}{order_clause}{limit_clause}",
+                    page_parameters + condition_params
+                ))
+            
+            counted = self._cached_count(filters, count_mode)
+            if counted is not None:
+                results = self._fetch_page(page_queries, page_size + 1)
+            elif self.list_query_mode == 'window' and not cursor_payload and count_mode == 'exact':
+                # A keyset condition narrows the page's WHERE clause, so
+                # cursor pages cannot read the total off the page query.
+                # COUNT(*) OVER () is evaluated before LIMIT, so every row of
+                # the page carries the total number of matches. It has no
+                # cap, so estimated counts keep the capped count query below.
+                windowed_query = (
+                    f"SELECT {select_columns}, COUNT(*) OVER () AS {self.WINDOW_COUNT_COLUMN}"
+                    f"{base_query}{page_where_clause}{order_clause}{limit_clause}"
+                )
+                results, counted = self._fetch_page_with_count(
+                    windowed_query, page_queries[0][0], page_parameters, filters, where_clause, parameters, count_mode
+                )
+            elif self.list_query_mode == 'concurrent':
+                results, counted = self._fetch_page_and_count(
+                    page_queries, page_size + 1, filters, where_clause, parameters, count_mode
+                )
+            else:
+                counted = self._count_books(filters, where_clause, parameters, count_mode)
+                results = self._fetch_page(page_queries, page_size + 1)
+            total_count, total_count_exact = counted
             
-            results = self.db_service.execute_query(paginated_query, parameters)
+            has_more = len(results) > page_size
+            results = results[:page_size]
+            if backward:
+                results.reverse()
             
-            books = []
-            for row in results:
-                try:
-                    book = Book.from_db_row(row)
-                    books.append(book.to_dict())
-                except ValueError as e:
-                    logger.warning(f"Skipping invalid book row: {e}")
-                    continue
+            books = list(self._serialize_rows(results, projection))
             
-            total_pages = (total_count + page_size - 1) // page_size
-            has_next = page < total_pages
-            has_prev = page > 1
+            total_pages = None
+            if total_count is not None:
+                total_pages = (total_count + page_size - 1) // page_size
             
+            if cursor_payload:
+                has_next = True if backward else has_more
+                has_prev = has_more if backward else True
+            else:
+                has_next = has_more
+                has_prev = page > 1
+            
+            next_cursor = None
+            prev_cursor = None
+            if sort_column and results:
+                if has_next:
+                    last_row = results[-1]
+                    next_cursor = encode_cursor(sort_column, direction, last_row[sort_column], last_row['id'])
+                if has_prev:
+                    first_row = results[0]
+                    prev_cursor = encode_cursor(
+                        sort_column, direction, first_row[sort_column], first_row['id'], backward=True
+                    )
+            
+            applied_fields = self.filter_combiner.applied_fields(filters)
             return {
                 'books': books,
                 'pagination': {
-                    'current_page': page,
+                    'current_page': None if cursor_payload else page,
                     'page_size': page_size,
                     'total_count': total_count,
+                    'total_count_exact': total_count_exact,
                     'total_pages': total_pages,
+                    'count_mode': count_mode,
                     'has_next': has_next,
-                    'has_prev': has_prev
+                    'has_prev': has_prev,
+                    'next_cursor': next_cursor,
+                    'prev_cursor': prev_cursor
                 },
-                'filters_applied': {k: v for k, v in filters.items() if v is not None}
+                'filters_applied': {k: v for k, v in filters.items() if k in applied_fields}
             }
             
+        except ValueError:
+            raise
         except Exception as e:
             logger.error(f"Error in get_books_with_filters: {e}")
             raise
     
-    def get_book_by_id(self, book_id: int) -> Optional[Dict[str, Any]]:
+    def iter_books_with_filters(
+        self,
+        filters: Dict[str, Any] = None,
+        order_by: str = None,
+        order_direction: str = 'ASC',
+        fields: str = None,
+        chunk_size: int = None
+    ) -> Iterator[Dict[str, Any]]:
+        
+        if filters is None:
+            filters = {}
+        
+        projection = Book.resolve_fields(fields)
+        where_clause, parameters = self.filter_combiner.build_query(filters)
+        
+        sort_column = order_by if order_by and self._is_valid_column(order_by) else 'id'
+        direction = 'DESC' if order_direction.upper() == 'DESC' else 'ASC'
+        
+        query = f"SELECT {self._select_columns(projection)} FROM book{where_clause}"
+        if sort_column == 'id':
+            query += f" ORDER BY id {direction}"
+        else:
+            query += f" ORDER BY {sort_column} {direction}, id {direction}"
+        
+        self._check_query_plan(query, parameters)
+        rows = self.db_service.iter_query(query, parameters, chunk_size=chunk_size)
+        yield from self._serialize_rows(rows, projection)
+    
+    def _cached_count(self, filters: Dict[str, Any], count_mode: str) -> Optional[Tuple[Optional[int], bool]]:
+        
+        if count_mode == 'none':
+            return None, False
+        return self.count_cache.get(CountCache.make_key(filters), allow_stale=(count_mode == 'estimated'))
+    
+    def _count_books(
+        self,
+        filters: Dict[str, Any],
+        where_clause: str,
+        parameters: List[Any],
+        count_mode: str
+    ) -> Tuple[Optional[int], bool]:
+        
+        # Callers check _cached_count first; the generation is read before
+        # counting so a write racing the query is not cached.
+        cache_key = CountCache.make_key(filters)
+        generation = self.count_cache.generation
+        
+        if count_mode == 'estimated':
+            # Counting stops at the cap, so the cost is bounded no matter how
+            # many rows match; below the cap the number is exact.
+            count_query = (
+                f"SELECT COUNT(*) FROM (SELECT 1 FROM book{where_clause} "
+                f"LIMIT {self.count_estimate_cap})"
+            )
+            self._check_query_plan(count_query, parameters)
+            count_result = self.db_service.execute_query(count_query, parameters)
+            total_count = count_result[0][0] if count_result else 0
+            if total_count < self.count_estimate_cap:
+                self.count_cache.set(cache_key, total_count, generation=generation)
+                return total_count, True
+            return total_count, False
+        
+        count_query = f"SELECT COUNT(*) FROM book{where_clause}"
+        self._check_query_plan(count_query, parameters)
+        count_result = self.db_service.execute_query(count_query, parameters)
+        total_count = count_result[0][0] if count_result else 0
+        self.count_cache.set(cache_key, total_count, generation=generation)
+        return total_count, True
+    
+    def _fetch_page(self, page_queries: List[Tuple[str, List[Any]]], limit: int) -> List[sqlite3.Row]:
+        
+        # Cursor pages may span several keyset segments; each is read in
+        # index order and the next one only when the page is not full yet.
+        results = []
+        for query, parameters in page_queries:
+            self._check_query_plan(query, parameters)
+            results.extend(self.db_service.execute_query(query, parameters))
+            if len(results) >= limit:
+                break
+        return results[:limit]
+    
+    def _fetch_page_and_count(
+        self,
+        page_queries: List[Tuple[str, List[Any]]],
+        limit: int,
+        filters: Dict[str, Any],
+        where_clause: str,
+        parameters: List[Any],
+        count_mode: str
+    ) -> Tuple[List[sqlite3.Row], Tuple[Optional[int], bool]]:
         
+        # The count runs on the query executor while this thread, which
+        # would otherwise wait on it, fetches the page.
+        count_future = submit(self.query_executor, self._count_books, filters, where_clause, parameters, count_mode)
+        results = self._fetch_page(page_queries, limit)
         try:
-            query = "SELECT * FROM book WHERE id = ?"
+            counted = count_future.result(timeout=self.list_query_timeout)
+        except FutureTimeoutError:
+            # The count keeps running and fills the count cache for later
+            # requests; this page goes out without a total.
+            logger.warning(f"Count query exceeded {self.list_query_timeout}s, returning page without total")
+            counted = (None, False)
+        return results, counted
+    
+    def _fetch_page_with_count(
+        self,
+        windowed_query: str,
+        paginated_query: str,
+        page_parameters: List[Any],
+        filters: Dict[str, Any],
+        where_clause: str,
+        parameters: List[Any],
+        count_mode: str
+    ) -> Tuple[List[sqlite3.Row], Tuple[Optional[int], bool]]:
+        
+        # The window always materializes the matching rows, which the plan
+        # guard would report on every query; index use is judged on the
+        # plain page query instead.
+        self._check_query_plan(paginated_query, page_parameters)
+        generation = self.count_cache.generation
+        results = self.db_service.execute_query(windowed_query, page_parameters)
+        if not results:
+            # A page past the end has no row to read the total from.
+            return results, self._count_books(filters, where_clause, parameters, count_mode)
+        
+        total_count = results[0][self.WINDOW_COUNT_COLUMN]
+        self.count_cache.set(CountCache.make_key(filters), total_count, generation=generation)
+        return results, (total_count, True)
+    
+    def _invalidate_caches(self) -> None:
+        
+        # The version goes first so requests after the write get its new
+        # ETag. Single-flight goes next: a reader that sees the new cache
+        # generation must not join a query started before the write.
+        self.catalog_version.refresh()
+        if self.single_flight is not None:
+            self.single_flight.invalidate()
+        self.count_cache.invalidate()
+        if self.response_cache is not None:
+            self.response_cache.invalidate()
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        
+        return {
+            'counts': self.count_cache.stats(),
+            'responses': self.response_cache.stats() if self.response_cache is not None else None
+        }
+    
+    def get_single_flight_stats(self) -> Optional[Dict[str, Any]]:
+        
+        return self.single_flight.stats() if self.single_flight is not None else None
+    
+    def _check_query_plan(self, query: str, parameters: List[Any]) -> None:
+        
+        if self.query_plan_guard is not None:
+            self.query_plan_guard.check(query, parameters)
+    
+    def _select_columns(self, projection: Optional[List[str]], sort_column: Optional[str] = None) -> str:
+        
+        if projection is None:
+            return "*"
+        
+        columns = ['id'] + [BOOK_FIELD_COLUMNS[field] for field in projection]
+        if sort_column:
+            columns.append(sort_column)
+        return ", ".join(dict.fromkeys(columns))
+    
+    def _serialize_rows(self, rows: Iterable[sqlite3.Row], projection: Optional[List[str]]) -> Iterator[Dict[str, Any]]:
+        
+        # Every row of a result set shares the cursor's columns, so the
+        # column-to-field mapping is resolved once from the first row.
+        mapper = None
+        for row in rows:
+            if mapper is None:
+                try:
+                    mapper = get_book_row_mapper(
+                        tuple(row.keys()), tuple(projection) if projection is not None else None
+                    )
+                except ValueError as e:
+                    logger.warning(f"Skipping invalid book rows: {e}")
+                    return
+            yield mapper.to_dict(row)
+    
+    @log_service_calls('BookService')
+    @cached_method('book')
+    def get_book_by_id(self, book_id: int, fields: str = None) -> Optional[Dict[str, Any]]:
+        
+        try:
+            projection = Book.resolve_fields(fields)
+            query = f"SELECT {self._select_columns(projection)} FROM book WHERE id = ?"
             results = self.db_service.execute_query(query, [book_id])
             
             if not results:
                 return None
             
-            book = Book.from_db_row(results[0])
-            return book.to_dict()
+            return next(self._serialize_rows(results, projection), None)
             
+        except ValueError:
+            raise
         except Exception as e:
             logger.error(f"Error getting book by ID {book_id}: {e}")
             raise
     
+    @log_service_calls('BookService')
     def create_book(self, book_data: Dict[str, Any]) -> Dict[str, Any]:
         
         try:
@@ -124,33 +515,11 @@ class BookService:
                 if not book_data.get(field):
                     raise ValueError(f"Missing required field: {field}")
             
-          
-            max_id_result = self.db_service.execute_query("SELECT MAX(id) FROM book")
-            next_id = (max_id_result[0][0] or 0) + 1 if max_id_result else 1
-            
             fields = ['id']  
-            values = [next_id]
+            values = []
             placeholders = ['?']
             
-            field_mapping = {
-                'title': 'title',
-                'author': 'author',
-                'author_bio': 'author_bio',
-                'authors': 'authors',
-                'author_slug': 'author_slug',
-                'publisher': 'publisher',
-                'synopsis': 'synopsis',
-                'subjects': 'subjects',
-                'isbn13': 'isbn13',
-                'isbn10': 'isbn10',
-                'price': 'price',
-                'format': 'format',
-                'pages': 'pages',
-                'overview': 'overview',
-                'excerpt': 'excerpt'
-            }
-            
-            for api_field, db_field in field_mapping.items():
+            for api_field, db_field in WRITABLE_FIELDS.items():
                 if api_field in book_data and book_data[api_field] is not None:
                     fields.append(db_field)
                     values.append(book_data[api_field])
@@ -164,18 +533,28 @@ class BookService:
                 VALUES ({', '.join(placeholders)})
             """
             
-            logger.info(f"Creating book with ID {next_id}: {book_data.get('title')}")
-            affected_rows = self.db_service.execute_insert(query, values)
-            
-            if affected_rows == 0:
-                raise ValueError("Failed to insert book")
+            # The id is allocated inside the writer transaction so concurrent
+            # creates cannot both read the same MAX(id).
+            with self.db_service.transaction() as conn:
+                max_id_row = conn.execute("SELECT MAX(id) FROM book").fetchone()
+                next_id = (max_id_row[0] or 0) + 1
+                
+                logger.info("Creating book with ID %s: %s", next_id, book_data.get('title'))
+                cursor = conn.execute(query, [next_id] + values)
+                
+                if cursor.rowcount == 0:
+                    raise ValueError("Failed to insert book")
             
+            self._invalidate_caches()
             return self.get_book_by_id(next_id)
             
+        except ValueError:
+            raise
         except Exception as e:
             logger.error(f"Error creating book: {e}")
             raise
 
+    @log_service_calls('BookService')
     def update_book(self, book_id: int, book_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         try:
             existing_book = self.get_book_by_id(book_id)
@@ -185,25 +564,7 @@ class BookService:
             fields = []
             values = []
             
-            field_mapping = {
-                'title': 'title',
-                'author': 'author',
-                'author_bio': 'author_bio',
-                'authors': 'authors',
-                'author_slug': 'author_slug',
-                'publisher': 'publisher',
-                'synopsis': 'synopsis',
-                'subjects': 'subjects',
-                'isbn13': 'isbn13',
-                'isbn10': 'isbn10',
-                'price': 'price',
-                'format': 'format',
-                'pages': 'pages',
-                'overview': 'overview',
-                'excerpt': 'excerpt'
-            }
-            
-            for api_field, db_field in field_mapping.items():
+            for api_field, db_field in WRITABLE_FIELDS.items():
                 if api_field in book_data:
                     fields.append(f"{db_field} = ?")
                     values.append(book_data[api_field])
@@ -219,18 +580,23 @@ class BookService:
                 WHERE id = ?
             """
             
-            affected_rows = self.db_service.execute_update(query, values)
+            with self.db_service.transaction() as conn:
+                affected_rows = conn.execute(query, values).rowcount
             
             if affected_rows == 0:
                 return None
             
-            logger.info(f"Book updated: ID {book_id}")
+            self._invalidate_caches()
+            logger.info("Book updated: ID %s", book_id)
             return self.get_book_by_id(book_id)
             
+        except ValueError:
+            raise
         except Exception as e:
             logger.error(f"Error updating book {book_id}: {e}")
             raise
 
+    @log_service_calls('BookService')
     def delete_book(self, book_id: int) -> bool:
         
         try:
@@ -239,10 +605,12 @@ class BookService:
                 return False
             
             query = "DELETE FROM book WHERE id = ?"
-            affected_rows = self.db_service.execute_delete(query, [book_id])
+            with self.db_service.transaction() as conn:
+                affected_rows = conn.execute(query, [book_id]).rowcount
             
             if affected_rows > 0:
-                logger.info(f"Book deleted: ID {book_id}")
+                self._invalidate_caches()
+                logger.info("Book deleted: ID %s", book_id)
                 return True
             else:
                 logger.warning(f"No book found with ID {book_id} for deletion")
@@ -252,35 +620,213 @@ class BookService:
             logger.error(f"Error deleting book {book_id}: {e}")
             raise
     
-    def get_authors(self) -> List[Dict[str, Any]]:
+    @log_service_calls('BookService')
+    def bulk_upsert_books(self, items: Iterable[Any], batch_size: int = 500) -> Dict[str, Any]:
+        
+        start_time = time.perf_counter()
+        results = []
+        stats = {'received': 0, 'inserted': 0, 'updated': 0, 'failed': 0, 'batches': 0}
+        batch = []
+        
+        def flush():
+            stats['batches'] += 1
+            for result in self._write_bulk_batch(batch):
+                stats[result['status'] if result['status'] != 'error' else 'failed'] += 1
+                results.append(result)
+            batch.clear()
         
         try:
-            query = "SELECT * FROM author ORDER BY title"
-            results = self.db_service.execute_query(query)
-            
-            authors = []
-            for row in results:
-                try:
-                    author = Author.from_db_row(row)
-                    authors.append(author.to_dict())
-                except ValueError as e:
-                    logger.warning(f"Skipping invalid author row: {e}")
+            for index, item in enumerate(items):
+                stats['received'] += 1
+                data, error = self._validate_bulk_item(item)
+                if error:
+                    stats['failed'] += 1
+                    results.append({'index': index, 'status': 'error', 'error': error})
                     continue
+                
+                batch.append((index, data))
+                if len(batch) >= batch_size:
+                    flush()
             
-            return authors
+            if batch:
+                flush()
+            
+        finally:
+            if stats['inserted'] or stats['updated']:
+                self._invalidate_caches()
+        
+        elapsed = time.perf_counter() - start_time
+        logger.info(
+            "Bulk upsert: %s inserted, %s updated, %s failed in %s batches (%sms)",
+            stats['inserted'], stats['updated'], stats['failed'], stats['batches'], round(elapsed * 1000, 2)
+        )
+        
+        results.sort(key=lambda result: result['index'])
+        return {
+            'results': results,
+            'stats': {
+                **stats,
+                'batch_size': batch_size,
+                'elapsed_ms': round(elapsed * 1000, 2),
+                'items_per_second': round(stats['received'] / elapsed, 2) if elapsed > 0 else None
+            }
+        }
+    
+    def _validate_bulk_item(self, item: Any) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        
+        # Unparseable NDJSON lines arrive as the exception raised for them.
+        if isinstance(item, Exception):
+            return None, str(item)
+        if not isinstance(item, dict):
+            return None, "Item must be a JSON object"
+        
+        data = {field: item[field] for field in WRITABLE_FIELDS if field in item}
+        if not data:
+            return None, "No valid fields provided"
+        
+        isbn13 = data.get('isbn13')
+        if isbn13 is not None:
+            if isinstance(isbn13, str) and isbn13.strip().isdigit():
+                data['isbn13'] = int(isbn13.strip())
+            elif not isinstance(isbn13, int) or isinstance(isbn13, bool):
+                return None, "isbn13 must be numeric"
+        
+        # Checked here because sqlite3 rejects these while binding, which
+        # would otherwise surface as a failure of the whole batch.
+        for field, value in data.items():
+            if value is None or isinstance(value, (str, float)):
+                continue
+            if not isinstance(value, int) or isinstance(value, bool):
+                return None, f"{field} must be a string, number or null"
+            if not SQLITE_INT_MIN <= value <= SQLITE_INT_MAX:
+                return None, f"{field} is out of range"
+        
+        return data, None
+    
+    def _write_bulk_batch(self, batch: List[Tuple[int, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        
+        results = []
+        columns = list(WRITABLE_FIELDS.values())
+        insert_query = (
+            f"INSERT INTO book (id, {', '.join(columns)}) "
+            f"VALUES ({', '.join(['?'] * (len(columns) + 1))})"
+        )
+        
+        try:
+            with self.db_service.transaction() as conn:
+                isbns = list({data['isbn13'] for _, data in batch if data.get('isbn13') is not None})
+                existing = {}
+                for start in range(0, len(isbns), 500):
+                    chunk = isbns[start:start + 500]
+                    rows = conn.execute(
+                        f"SELECT isbn13, id FROM book WHERE isbn13 IN ({', '.join(['?'] * len(chunk))})", chunk
+                    ).fetchall()
+                    existing.update({row[0]: row[1] for row in rows})
+                
+                max_id_row = conn.execute("SELECT MAX(id) FROM book").fetchone()
+                next_id = (max_id_row[0] or 0) + 1
+                
+                for index, data in batch:
+                    isbn13 = data.get('isbn13')
+                    book_id = existing.get(isbn13) if isbn13 is not None else None
+                    
+                    if book_id is None:
+                        missing = [field for field in ('title', 'author') if not data.get(field)]
+                        if missing:
+                            results.append({
+                                'index': index,
+                                'status': 'error',
+                                'error': f"Missing required field: {missing[0]}"
+                            })
+                            continue
+                        
+                        query = insert_query
+                        values = [next_id] + [data.get(field) for field in WRITABLE_FIELDS]
+                    else:
+                        update_fields = [field for field in WRITABLE_FIELDS if field in data]
+                        assignments = ', '.join(f"{WRITABLE_FIELDS[field]} = ?" for field in update_fields)
+                        query = f"UPDATE book SET {assignments} WHERE id = ?"
+                        values = [data[field] for field in update_fields] + [book_id]
+                    
+                    # Each item gets its own savepoint so a row the database
+                    # rejects is rolled back alone and its neighbours commit.
+                    conn.execute("SAVEPOINT bulk_item")
+                    try:
+                        conn.execute(query, values)
+                    except sqlite3.Error as e:
+                        conn.execute("ROLLBACK TO bulk_item")
+                        conn.execute("RELEASE bulk_item")
+                        results.append({'index': index, 'status': 'error', 'error': str(e)})
+                        continue
+                    conn.execute("RELEASE bulk_item")
+                    
+                    if book_id is None:
+                        book_id = next_id
+                        next_id += 1
+                        if isbn13 is not None:
+                            existing[isbn13] = book_id
+                        results.append({'index': index, 'status': 'inserted', 'id': book_id})
+                    else:
+                        results.append({'index': index, 'status': 'updated', 'id': book_id})
+            
+            return results
+            
+        except sqlite3.Error as e:
+            logger.error(f"Bulk batch of {len(batch)} items failed: {e}")
+            return [
+                {'index': index, 'status': 'error', 'error': f"Batch failed: {e}"}
+                for index, _ in batch
+            ]
+    
+    @log_service_calls('BookService')
+    @cached_method('authors')
+    def get_authors(self) -> List[Dict[str, Any]]:
+        
+        try:
+            return list(self.iter_authors())
             
         except Exception as e:
             logger.error(f"Error getting authors: {e}")
             raise
     
+    def iter_authors(self, chunk_size: int = None) -> Iterator[Dict[str, Any]]:
+        
+        query = "SELECT * FROM author ORDER BY title"
+        for row in self.db_service.iter_query(query, chunk_size=chunk_size):
+            try:
+                yield Author.from_db_row(row).to_dict()
+            except ValueError as e:
+                logger.warning(f"Skipping invalid author row: {e}")
+    
+    def iter_books_by_author(
+        self,
+        author_slug: str,
+        order_by: str = None,
+        order_direction: str = 'ASC',
+        fields: str = None,
+        chunk_size: int = None
+    ) -> Iterator[Dict[str, Any]]:
+        
+        return self.iter_books_with_filters(
+            filters={'author_slug': author_slug},
+            order_by=order_by,
+            order_direction=order_direction,
+            fields=fields,
+            chunk_size=chunk_size
+        )
+    
+    @log_service_calls('BookService')
+    @cached_method('subjects')
     def get_available_subjects(self) -> List[str]:
         
         try:
+            if self.subject_catalog_enabled:
+                return self.subject_catalog.list_subjects()
+            
             query = "SELECT DISTINCT subjects FROM book WHERE subjects IS NOT NULL AND subjects != ''"
-            results = self.db_service.execute_query(query)
             
             subjects = set()
-            for row in results:
+            for row in self.db_service.iter_query(query):
                 subject_str = row[0]
                 if subject_str:
                     for subject in subject_str.split(','):
@@ -294,6 +840,29 @@ class BookService:
             logger.error(f"Error getting subjects: {e}")
             raise
     
+    @log_service_calls('BookService')
+    @cached_method('subject_counts')
+    def get_subject_counts(self) -> List[Dict[str, Any]]:
+        
+        try:
+            if self.subject_catalog_enabled:
+                return self.subject_catalog.subject_counts()
+            
+            query = "SELECT subjects FROM book WHERE subjects IS NOT NULL AND subjects != ''"
+            
+            counts = {}
+            for row in self.db_service.iter_query(query):
+                for subject in SubjectCatalog.split_subjects(row[0]):
+                    counts[subject] = counts.get(subject, 0) + 1
+            
+            return [{'subject': subject, 'book_count': counts[subject]} for subject in sorted(counts)]
+            
+        except Exception as e:
+            logger.error(f"Error getting subject counts: {e}")
+            raise
+    
+    @log_service_calls('BookService')
+    @cached_method('publishers')
     def get_available_publishers(self) -> List[str]:
         
         try:
@@ -306,6 +875,18 @@ class BookService:
             logger.error(f"Error getting publishers: {e}")
             raise
     
+    def _build_match_expression(self, filters: Dict[str, Any]) -> Optional[str]:
+        
+        expressions = []
+        for filter_obj in self.available_filters:
+            if not isinstance(filter_obj, FullTextFilter):
+                continue
+            value = filters.get(filter_obj.field_name)
+            if value is not None and filter_obj.is_valid(value):
+                expressions.append(f"({filter_obj.match_expression(value)})")
+        
+        return " AND ".join(expressions) if expressions else None
+    
     def _is_valid_column(self, column_name: str) -> bool:
         
         valid_columns = {
@@ -317,6 +898,8 @@ class BookService:
         
         return column_name in valid_columns
     
+    @log_service_calls('BookService')
+    @cached_method('filter_options')
     def get_filter_options(self) -> Dict[str, Any]:
         
         try:
@@ -324,7 +907,7 @@ class BookService:
                 'text_filters': [
                     'title', 'author', 'author_bio', 'authors', 'publisher', 
                     'synopsis', 'subjects', 'overview', 'excerpt'
-                ],
+                ] + (['q'] if self.full_text_enabled else []),
                 'exact_filters': [
                     'author_slug', 'format', 'edition'
                 ],
@@ -334,11 +917,13 @@ class BookService:
                 'multi_value_filters': [
                     'subjects', 'format'
                 ],
+                'subject_modes': list(SubjectFilter.MODES),
                 'available_subjects': self.get_available_subjects(),
                 'available_publishers': self.get_available_publishers(),
+                'full_text_search': self.full_text_enabled,
                 'sort_options': [
                     'title', 'author', 'publisher', 'pubdate', 'pages'
-                ]
+                ] + (['relevance'] if self.full_text_enabled else [])
             }
             
         except Exception as e:
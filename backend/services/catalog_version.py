@@ -0,0 +1,105 @@
+import time
+import logging
+from threading import Lock
+from typing import Optional, Tuple
+
+from services.database_service import DatabaseService
+
+logger = logging.getLogger(__name__)
+
+
+CATALOG_META_TABLE = 'catalog_meta'
+CATALOG_TABLES = ['book', 'author']
+
+
+class CatalogVersion:
+    def __init__(self, db_service: DatabaseService, ttl: float = 1.0):
+        self.db_service = db_service
+        self.ttl = ttl
+        self._current: Optional[Tuple[int, float]] = None
+        self._read_at = 0.0
+        self._lock = Lock()
+        self.table_enabled = self.is_available()
+        if not self.table_enabled:
+            logger.warning(
+                f"Catalog version table {CATALOG_META_TABLE} not found; responses carry no ETag "
+                f"and caches only see writes made by this process"
+            )
+
+    def is_available(self) -> bool:
+        try:
+            return self.db_service.table_exists(CATALOG_META_TABLE)
+        except Exception as e:
+            logger.warning(f"Could not check catalog version table: {e}")
+            return False
+
+    def create(self) -> None:
+        now = "(julianday('now') - 2440587.5) * 86400.0"
+        with self.db_service.transaction() as conn:
+            conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS {CATALOG_META_TABLE} (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    version INTEGER NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            conn.execute(
+                f"INSERT OR IGNORE INTO {CATALOG_META_TABLE} (id, version, updated_at) VALUES (1, 1, {now})"
+            )
+            for table in CATALOG_TABLES:
+                for event in ('INSERT', 'UPDATE', 'DELETE'):
+                    conn.execute(f"""
+                        CREATE TRIGGER IF NOT EXISTS {CATALOG_META_TABLE}_{table}_{event.lower()}
+                        AFTER {event} ON {table} BEGIN
+                            UPDATE {CATALOG_META_TABLE} SET version = version + 1, updated_at = {now} WHERE id = 1;
+                        END
+                    """)
+        logger.info("Catalog version table %s created", CATALOG_META_TABLE)
+
+    def drop(self) -> None:
+        with self.db_service.transaction() as conn:
+            for table in CATALOG_TABLES:
+                for event in ('insert', 'update', 'delete'):
+                    conn.execute(f"DROP TRIGGER IF EXISTS {CATALOG_META_TABLE}_{table}_{event}")
+            conn.execute(f"DROP TABLE IF EXISTS {CATALOG_META_TABLE}")
+        logger.info("Catalog version table %s dropped", CATALOG_META_TABLE)
+
+    def current(self) -> Optional[Tuple[str, float]]:
+        # The table is shared by every worker and also catches writes made
+        # outside the API. Without it there is no version all workers agree
+        # on, so there is none at all: a per-process counter would hand out
+        # tags that other workers could match for different data.
+        if not self.table_enabled:
+            return None
+
+        # Every cache lookup and conditional request asks for the version,
+        # so it is kept in process. Writes through this process refresh it
+        # right away; other writers show up within ttl seconds.
+        current = self._current
+        if current is None or time.monotonic() - self._read_at >= self.ttl:
+            current = self.refresh()
+            if current is None:
+                return None
+        return f"v{current[0]}", current[1]
+
+    def refresh(self) -> Optional[Tuple[int, float]]:
+        if not self.table_enabled:
+            return None
+
+        read_at = time.monotonic()
+        results = self.db_service.execute_query(
+            f"SELECT version, updated_at FROM {CATALOG_META_TABLE} WHERE id = 1"
+        )
+        if not results:
+            return None
+
+        with self._lock:
+            # A slower concurrent read must not move the version backwards.
+            if self._current is None or results[0][0] >= self._current[0]:
+                self._current = (results[0][0], results[0][1])
+            self._read_at = max(self._read_at, read_at)
+            return self._current
+
+    def version(self) -> Optional[str]:
+        current = self.current()
+        return current[0] if current is not None else None
@@ -0,0 +1,212 @@
+import sqlite3
+import time
+import logging
+from collections import deque
+from contextlib import contextmanager
+from threading import Condition
+from typing import Deque, Dict, Any, List, Tuple, Optional
+
+from services.storage_profile import StorageProfile
+
+logger = logging.getLogger(__name__)
+
+
+class ConnectionPoolError(sqlite3.OperationalError):
+    pass
+
+
+class ConnectionPool:
+    def __init__(
+        self,
+        db_path: str,
+        max_size: int = 5,
+        timeout: float = 5.0,
+        idle_timeout: float = 300.0,
+        validate: bool = True,
+        profile: Optional[StorageProfile] = None,
+        read_only: bool = False
+    ):
+        if max_size < 1:
+            raise ValueError("Pool size must be >= 1")
+
+        self.db_path = db_path
+        # Every connection to ':memory:' is a separate database, so a single
+        # shared connection is the only way to keep a consistent view.
+        self.max_size = 1 if db_path == ':memory:' else max_size
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.validate = validate
+        self.profile = profile
+        self.read_only = read_only
+
+        self._idle: Deque[Tuple[sqlite3.Connection, float]] = deque()
+        self._size = 0
+        self._closed = False
+        self._condition = Condition()
+        self._inherited: List[sqlite3.Connection] = []
+        self._stats = self._empty_stats()
+
+    @staticmethod
+    def _empty_stats() -> Dict[str, Any]:
+        return {
+            'created': 0,
+            'checkouts': 0,
+            'reused': 0,
+            'closed': 0,
+            'idle_expired': 0,
+            'validation_failures': 0,
+            'timeouts': 0,
+            'wait_time_ms': 0.0
+        }
+
+    def _create_connection(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        try:
+            if self.profile:
+                self.profile.apply(conn, read_only=self.read_only)
+            elif self.read_only:
+                conn.execute("PRAGMA query_only = ON")
+        except sqlite3.Error:
+            conn.close()
+            raise
+        return conn
+
+    def _is_healthy(self, conn: sqlite3.Connection) -> bool:
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def _close_connection(self, conn: sqlite3.Connection) -> None:
+        try:
+            conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"Error closing pooled connection: {e}")
+        self._stats['closed'] += 1
+
+    def acquire(self) -> sqlite3.Connection:
+        start_time = time.monotonic()
+        deadline = start_time + self.timeout
+
+        while True:
+            conn = None
+            with self._condition:
+                if self._closed:
+                    raise ConnectionPoolError("Connection pool is closed")
+
+                while self._idle:
+                    candidate, last_used = self._idle.pop()
+                    if self.idle_timeout and time.monotonic() - last_used > self.idle_timeout:
+                        self._size -= 1
+                        self._stats['idle_expired'] += 1
+                        self._close_connection(candidate)
+                        continue
+                    conn = candidate
+                    break
+
+                if conn is None:
+                    if self._size < self.max_size:
+                        self._size += 1
+                    else:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            self._stats['timeouts'] += 1
+                            raise ConnectionPoolError(
+                                f"Timed out after {self.timeout}s waiting for a database connection"
+                            )
+                        self._condition.wait(remaining)
+                        continue
+
+            if conn is None:
+                try:
+                    conn = self._create_connection()
+                except sqlite3.Error:
+                    with self._condition:
+                        self._size -= 1
+                        self._condition.notify()
+                    raise
+                with self._condition:
+                    self._stats['created'] += 1
+            elif self.validate and not self._is_healthy(conn):
+                with self._condition:
+                    self._size -= 1
+                    self._stats['validation_failures'] += 1
+                    self._close_connection(conn)
+                    self._condition.notify()
+                continue
+            else:
+                with self._condition:
+                    self._stats['reused'] += 1
+
+            with self._condition:
+                self._stats['checkouts'] += 1
+                self._stats['wait_time_ms'] += (time.monotonic() - start_time) * 1000
+            return conn
+
+    def release(self, conn: sqlite3.Connection, discard: bool = False) -> None:
+        if not discard:
+            try:
+                if conn.in_transaction:
+                    conn.rollback()
+            except sqlite3.Error:
+                discard = True
+
+        with self._condition:
+            if discard or self._closed:
+                self._size -= 1
+                self._close_connection(conn)
+            else:
+                self._idle.append((conn, time.monotonic()))
+            self._condition.notify()
+
+    @contextmanager
+    def connection(self):
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            while self._idle:
+                conn, _ = self._idle.pop()
+                self._size -= 1
+                self._close_connection(conn)
+            self._condition.notify_all()
+        logger.info("Connection pool closed")
+
+    def close_idle(self) -> None:
+        with self._condition:
+            while self._idle:
+                conn, _ = self._idle.pop()
+                self._size -= 1
+                self._close_connection(conn)
+
+    def reset_after_fork(self) -> None:
+        # SQLite handles must not be used, or closed, on both sides of a
+        # fork. Anything inherited from the parent is kept referenced but
+        # never touched again, and the lock is replaced in case it was held
+        # when the process forked.
+        self._inherited.extend(conn for conn, _ in self._idle)
+        self._idle = deque()
+        self._size = 0
+        self._closed = False
+        self._condition = Condition()
+        self._stats = self._empty_stats()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._condition:
+            idle = len(self._idle)
+            return {
+                **self._stats,
+                'wait_time_ms': round(self._stats['wait_time_ms'], 2),
+                'size': self._size,
+                'idle': idle,
+                'in_use': self._size - idle,
+                'max_size': self.max_size,
+                'read_only': self.read_only
+            }
@@ -0,0 +1,20 @@
+import json
+from typing import Any, Dict, Optional, Tuple
+
+from core.cache import LRUCache
+
+
+class CountCache(LRUCache):
+    @staticmethod
+    def make_key(filters: Dict[str, Any]) -> str:
+        normalized = {
+            k: v.strip() if isinstance(v, str) else v
+            for k, v in filters.items() if v is not None
+        }
+        return json.dumps(normalized, sort_keys=True, default=str)
+
+    def get(self, key: str, allow_stale: bool = False) -> Optional[Tuple[int, bool]]:
+        found, count, fresh = self.lookup(key, allow_stale=allow_stale)
+        if not found:
+            return None
+        return count, fresh
@@ -0,0 +1,66 @@
+import json
+import base64
+import binascii
+from typing import Any, Dict, List, Tuple
+
+
+# Sort keys bound straight into the keyset condition; every other sortable
+# column of book has TEXT affinity.
+NUMERIC_COLUMNS = {'id', 'isbn13', 'pages'}
+
+
+def encode_cursor(order_by: str, direction: str, value: Any, row_id: int, backward: bool = False) -> str:
+    payload = {'o': order_by, 'd': direction, 'v': value, 'id': row_id}
+    if backward:
+        payload['r'] = 1
+    raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str, order_by: str, direction: str) -> Dict[str, Any]:
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, binascii.Error, UnicodeError):
+        raise ValueError("Invalid cursor")
+
+    if not isinstance(payload, dict) or 'id' not in payload or 'v' not in payload:
+        raise ValueError("Invalid cursor")
+
+    if payload.get('o') != order_by or payload.get('d') != direction:
+        raise ValueError("Cursor does not match the requested ordering")
+
+    # The values end up as bind parameters; anything sqlite cannot bind (or
+    # would compare across types) must be a 400, not a database error.
+    if not _is_number(payload['id']) or isinstance(payload['id'], float):
+        raise ValueError("Invalid cursor")
+    value = payload['v']
+    expected = _is_number if order_by in NUMERIC_COLUMNS else (lambda v: isinstance(v, str))
+    if value is not None and not expected(value):
+        raise ValueError("Invalid cursor")
+
+    return payload
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def keyset_segments(column: str, direction: str, value: Any, row_id: int) -> List[Tuple[str, List[Any]]]:
+    # Seeks past (value, row_id) in ORDER BY column, id. SQLite sorts NULLs
+    # first ascending and last descending. An OR across the NULL and
+    # non-NULL keys turns the seek into a MULTI-INDEX OR plus a sort of
+    # every remaining row, so the two ranges are returned as separate
+    # conditions, in page order, for the caller to read one after the other.
+    if column == 'id':
+        operator = '<' if direction == 'DESC' else '>'
+        return [(f"id {operator} ?", [row_id])]
+
+    if direction == 'DESC':
+        if value is None:
+            return [(f"{column} IS NULL AND id < ?", [row_id])]
+        return [(f"({column}, id) < (?, ?)", [value, row_id]), (f"{column} IS NULL", [])]
+
+    if value is None:
+        return [(f"{column} IS NULL AND id > ?", [row_id]), (f"{column} IS NOT NULL", [])]
+    return [(f"({column}, id) > (?, ?)", [value, row_id])]
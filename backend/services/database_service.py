@@ -1,49 +1,138 @@
+import time
 import sqlite3
 from contextlib import contextmanager
-from typing import List, Tuple, Any
+from typing import List, Tuple, Any, Dict, Iterator, Callable
 import logging
 
+from services.connection_pool import ConnectionPool
+
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
 class DatabaseService:    
-    def __init__(self, db_path: str = 'db.sqlite'):
+    def __init__(
+        self,
+        db_path: str = 'db.sqlite',
+        pool: ConnectionPool = None,
+        read_pool: ConnectionPool = None,
+        iter_chunk_size: int = 1000
+    ):
         self.db_path = db_path
+        self.iter_chunk_size = iter_chunk_size
+        self._query_listeners: List[Callable[[str, str, List[Any], float, int], None]] = []
+        self.pool = pool or ConnectionPool(db_path, max_size=1)
+        # An in-memory database only exists on its own connection, so reads
+        # have to share the writer there.
+        if db_path == ':memory:':
+            self.read_pool = self.pool
+        else:
+            self.read_pool = read_pool or ConnectionPool(db_path, read_only=True)
     
     @contextmanager
-    def get_connection(self):
-        conn = None
-        try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
-            yield conn
-        except sqlite3.Error as e:
-            logger.error(f"Database error: {e}")
-            if conn:
+    def get_connection(self, read_only: bool = False):
+        pool = self.read_pool if read_only else self.pool
+        with pool.connection() as conn:
+            try:
+                yield conn
+            except sqlite3.Error as e:
+                logger.error(f"Database error: {e}")
                 conn.rollback()
-            raise
-        finally:
-            if conn:
-                conn.close()
+                raise
+    
+    @contextmanager
+    def transaction(self):
+        with self.get_connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except Exception:
+                conn.rollback()
+                raise
+            conn.commit()
+    
+    def add_query_listener(self, listener: Callable[[str, str, List[Any], float, int], None]) -> None:
+        self._query_listeners.append(listener)
+    
+    def _notify_query(self, operation: str, query: str, parameters: List[Any], started: float, rows: int) -> None:
+        if not self._query_listeners:
+            return
+        
+        duration = time.perf_counter() - started
+        for listener in self._query_listeners:
+            try:
+                listener(operation, query, parameters, duration, rows)
+            except Exception as e:
+                logger.warning(f"Query listener failed: {e}")
+    
+    def get_pool_stats(self) -> Dict[str, Any]:
+        if self.read_pool is self.pool:
+            return {'read': self.pool.stats(), 'write': self.pool.stats()}
+        return {'read': self.read_pool.stats(), 'write': self.pool.stats()}
+    
+    def close(self) -> None:
+        if self.read_pool is not self.pool:
+            self.read_pool.close()
+        self.pool.close()
+    
+    def close_idle_connections(self) -> None:
+        if self.read_pool is not self.pool:
+            self.read_pool.close_idle()
+        self.pool.close_idle()
+    
+    def reset_after_fork(self) -> None:
+        if self.read_pool is not self.pool:
+            self.read_pool.reset_after_fork()
+        self.pool.reset_after_fork()
     
     def execute_query(self, query: str, parameters: List[Any] = None) -> List[Tuple]:
         if parameters is None:
             parameters = []
         
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(read_only=True) as conn:
                 cursor = conn.cursor()
-                logger.info(f"Executing query: {query} with params: {parameters}")
+                logger.debug("Executing query: %s with params: %s", query, parameters)
+                started = time.perf_counter()
                 cursor.execute(query, parameters)
                 results = cursor.fetchall()
-                logger.info(f"Query returned {len(results)} rows")
+                self._notify_query('select', query, parameters, started, len(results))
+                logger.debug("Query returned %d rows", len(results))
                 return results
         except sqlite3.Error as e:
             logger.error(f"Query execution failed: {e}")
             raise
     
+    def iter_query(self, query: str, parameters: List[Any] = None, chunk_size: int = None) -> Iterator[sqlite3.Row]:
+        if parameters is None:
+            parameters = []
+        if chunk_size is None:
+            chunk_size = self.iter_chunk_size
+        
+        # The read connection stays checked out until the generator is
+        # exhausted or closed.
+        try:
+            with self.get_connection(read_only=True) as conn:
+                cursor = conn.cursor()
+                logger.debug("Streaming query: %s with params: %s", query, parameters)
+                started = time.perf_counter()
+                cursor.execute(query, parameters)
+                row_count = 0
+                try:
+                    while True:
+                        rows = cursor.fetchmany(chunk_size)
+                        if not rows:
+                            break
+                        row_count += len(rows)
+                        yield from rows
+                finally:
+                    cursor.close()
+                    # Includes the time the consumer spent between chunks.
+                    self._notify_query('stream', query, parameters, started, row_count)
+        except sqlite3.Error as e:
+            logger.error(f"Streaming query failed: {e}")
+            raise
+    
     def execute_insert(self, query: str, parameters: List[Any] = None) -> int:
         if parameters is None:
             parameters = []
@@ -51,11 +140,13 @@ class DatabaseService:
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
-                logger.info(f"Executing insert: {query} with params: {parameters}")
+                logger.debug("Executing insert: %s with params: %s", query, parameters)
+                started = time.perf_counter()
                 cursor.execute(query, parameters)
                 conn.commit()
+                self._notify_query('insert', query, parameters, started, cursor.rowcount)
                 last_id = cursor.lastrowid
-                logger.info(f"Insert successful, last row ID: {last_id}")
+                logger.debug("Insert successful, last row ID: %s", last_id)
                 return last_id
         except sqlite3.Error as e:
             logger.error(f"Insert execution failed: {e}")
@@ -68,11 +159,13 @@ class DatabaseService:
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
-                logger.info(f"Executing update: {query} with params: {parameters}")
+                logger.debug("Executing update: %s with params: %s", query, parameters)
+                started = time.perf_counter()
                 cursor.execute(query, parameters)
                 conn.commit()
+                self._notify_query('update', query, parameters, started, cursor.rowcount)
                 affected_rows = cursor.rowcount
-                logger.info(f"Update successful, affected rows: {affected_rows}")
+                logger.debug("Update successful, affected rows: %d", affected_rows)
                 return affected_rows
         except sqlite3.Error as e:
             logger.error(f"Update execution failed: {e}")
@@ -85,11 +178,13 @@ class DatabaseService:
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
-                logger.info(f"Executing delete: {query} with params: {parameters}")
+                logger.debug("Executing delete: %s with params: %s", query, parameters)
+                started = time.perf_counter()
                 cursor.execute(query, parameters)
                 conn.commit()
+                self._notify_query('delete', query, parameters, started, cursor.rowcount)
                 affected_rows = cursor.rowcount
-                logger.info(f"Delete successful, affected rows: {affected_rows}")
+                logger.debug("Delete successful, affected rows: %d", affected_rows)
                 return affected_rows
         except sqlite3.Error as e:
             logger.error(f"Delete execution failed: {e}")
@@ -0,0 +1,107 @@
+import time
+import logging
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, List, Optional
+from flask import g
+
+from core.metrics import normalize_query
+from core.profiling import QueryRecord, RequestTrace, current_trace
+from services.database_service import DatabaseService
+
+logger = logging.getLogger(__name__)
+slow_query_logger = logging.getLogger('slow_query')
+
+
+class QueryProfiler:
+    MODES = ('off', 'header', 'always')
+
+    def __init__(
+        self,
+        db_service: DatabaseService,
+        mode: str = 'off',
+        header: str = 'X-Profile',
+        slow_query_ms: float = 0,
+        explain: bool = True,
+        max_traces: int = 100
+    ):
+        if mode not in self.MODES:
+            raise ValueError(f"Profiler mode must be one of: {', '.join(self.MODES)}")
+
+        self.db_service = db_service
+        self.mode = mode
+        self.header = header
+        self.slow_query_ms = slow_query_ms
+        self.explain = explain
+        self.max_traces = max_traces
+        self._traces: 'OrderedDict[str, RequestTrace]' = OrderedDict()
+        self._lock = Lock()
+
+    def should_profile(self, headers) -> bool:
+        if self.mode == 'always':
+            return True
+        return self.mode == 'header' and headers.get(self.header, '').lower() in ('1', 'true', 'yes')
+
+    def start(self, request_id: str, method: str, path: str) -> RequestTrace:
+        trace = RequestTrace(request_id=request_id, method=method, path=path)
+        g.query_trace = trace
+        return trace
+
+    def __call__(self, operation: str, query: str, parameters: List[Any], duration: float, rows: int) -> None:
+        # Plans collected by the profiler or the query plan guard are not
+        # part of the request's own work.
+        if query.lstrip().upper().startswith('EXPLAIN'):
+            return
+
+        duration_ms = round(duration * 1000, 3)
+        trace = current_trace()
+
+        if self.slow_query_ms and duration_ms >= self.slow_query_ms:
+            slow_query_logger.warning(
+                "Slow query (%sms, %d rows): %s",
+                duration_ms, rows, query,
+                extra={
+                    'request_id': trace.request_id if trace is not None else None,
+                    'operation': operation,
+                    'shape': normalize_query(query),
+                    'duration_ms': duration_ms,
+                    'rows': rows
+                }
+            )
+
+        if trace is not None:
+            trace.queries.append(QueryRecord(
+                operation=operation,
+                query=query,
+                parameters=list(parameters),
+                duration_ms=duration_ms,
+                rows=rows
+            ))
+
+    def finish(self, trace: RequestTrace) -> RequestTrace:
+        trace.total_ms = round((time.perf_counter() - trace.started) * 1000, 3)
+
+        if self.explain:
+            plans: Dict[str, List[str]] = {}
+            for record in trace.queries:
+                if record.operation not in ('select', 'stream'):
+                    continue
+                if record.query not in plans:
+                    try:
+                        results = self.db_service.execute_query(
+                            f"EXPLAIN QUERY PLAN {record.query}", record.parameters
+                        )
+                        plans[record.query] = [row[3] for row in results]
+                    except Exception as e:
+                        plans[record.query] = [f"unavailable: {e}"]
+                record.plan = plans[record.query]
+
+        with self._lock:
+            self._traces[trace.request_id] = trace
+            while len(self._traces) > self.max_traces:
+                self._traces.popitem(last=False)
+        return trace
+
+    def get_trace(self, request_id: str) -> Optional[RequestTrace]:
+        with self._lock:
+            return self._traces.get(request_id)
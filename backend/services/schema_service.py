@@ -0,0 +1,180 @@
+import re
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Any, Dict, List, Optional
+
+from core.metrics import normalize_query
+from services.database_service import DatabaseService
+
+logger = logging.getLogger(__name__)
+
+_SELECT_LIST = re.compile(r"^SELECT .*? FROM ", re.IGNORECASE)
+
+
+@dataclass
+class IndexDefinition:
+    name: str
+    table: str
+    columns: List[str] = field(default_factory=list)
+    unique: bool = False
+
+    def create_sql(self) -> str:
+        unique = "UNIQUE " if self.unique else ""
+        return (
+            f"CREATE {unique}INDEX IF NOT EXISTS {self.name} "
+            f"ON {self.table} ({', '.join(self.columns)})"
+        )
+
+
+# Filter columns from BookService._initialize_filters and the sort options it
+# advertises; sort indexes end with id because listings tie-break on it.
+REQUIRED_INDEXES: List[IndexDefinition] = [
+    IndexDefinition('idx_book_id', 'book', ['id']),
+    IndexDefinition('idx_book_author_slug', 'book', ['author_slug', 'id']),
+    IndexDefinition('idx_book_format', 'book', ['format', 'id']),
+    IndexDefinition('idx_book_edition', 'book', ['edition', 'id']),
+    IndexDefinition('idx_book_isbn13', 'book', ['isbn13']),
+    IndexDefinition('idx_book_pages', 'book', ['pages', 'id']),
+    IndexDefinition('idx_book_title', 'book', ['title', 'id']),
+    IndexDefinition('idx_book_author', 'book', ['author', 'id']),
+    IndexDefinition('idx_book_publisher', 'book', ['publisher', 'id']),
+    IndexDefinition('idx_book_pubdate', 'book', ['pubdate', 'id']),
+    IndexDefinition('idx_book_author_slug_title', 'book', ['author_slug', 'title', 'id']),
+    IndexDefinition('idx_book_author_slug_pubdate', 'book', ['author_slug', 'pubdate', 'id']),
+    IndexDefinition('idx_book_format_title', 'book', ['format', 'title', 'id']),
+    IndexDefinition('idx_book_format_pubdate', 'book', ['format', 'pubdate', 'id']),
+    IndexDefinition('idx_author_title', 'author', ['title']),
+]
+
+
+class QueryPlanError(Exception):
+    pass
+
+
+class SchemaService:
+    def __init__(self, db_service: DatabaseService, indexes: Optional[List[IndexDefinition]] = None):
+        self.db_service = db_service
+        self.indexes = indexes if indexes is not None else REQUIRED_INDEXES
+
+    def existing_indexes(self) -> List[str]:
+        results = self.db_service.execute_query(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND name IS NOT NULL"
+        )
+        return [row[0] for row in results]
+
+    def missing_indexes(self) -> List[IndexDefinition]:
+        existing = set(self.existing_indexes())
+        return [index for index in self.indexes if index.name not in existing]
+
+    def ensure_indexes(self, analyze: bool = True) -> List[str]:
+        missing = self.missing_indexes()
+
+        with self.db_service.transaction() as conn:
+            for index in missing:
+                logger.info("Creating index %s on %s(%s)", index.name, index.table, ', '.join(index.columns))
+                conn.execute(index.create_sql())
+            if analyze and missing:
+                conn.execute("ANALYZE")
+
+        return [index.name for index in missing]
+
+    def drop_indexes(self) -> List[str]:
+        existing = set(self.existing_indexes())
+        dropped = []
+
+        with self.db_service.transaction() as conn:
+            for index in self.indexes:
+                if index.name in existing:
+                    conn.execute(f"DROP INDEX IF EXISTS {index.name}")
+                    dropped.append(index.name)
+
+        return dropped
+
+    def status(self) -> Dict[str, Any]:
+        existing = set(self.existing_indexes())
+        return {
+            index.name: {
+                'table': index.table,
+                'columns': index.columns,
+                'present': index.name in existing
+            }
+            for index in self.indexes
+        }
+
+
+class QueryPlanGuard:
+    MODES = ('off', 'warn', 'raise')
+
+    def __init__(self, db_service: DatabaseService, mode: str = 'warn', max_tracked: int = 512):
+        if mode not in self.MODES:
+            raise ValueError(f"Query plan guard mode must be one of: {', '.join(self.MODES)}")
+
+        self.db_service = db_service
+        self.mode = mode
+        self.max_tracked = max_tracked
+        self._checked: 'OrderedDict[str, List[str]]' = OrderedDict()
+        self._lock = Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != 'off'
+
+    def explain(self, query: str, parameters: List[Any] = None) -> List[str]:
+        results = self.db_service.execute_query(f"EXPLAIN QUERY PLAN {query}", parameters)
+        return [row[3] for row in results]
+
+    @staticmethod
+    def find_problems(plan: List[str], query: str) -> List[str]:
+        # Unfiltered queries read every row by design. An ordered index walk
+        # is fine when LIMIT can stop it early; without a LIMIT (e.g. COUNT
+        # queries) it reads the whole table just the same. Scanning a
+        # subquery's result (the capped COUNT) reads no table at all.
+        normalized = query.upper()
+        filtered = ' WHERE ' in normalized
+        limited = ' LIMIT ' in normalized
+
+        problems = []
+        for detail in plan:
+            if detail.startswith('USE TEMP B-TREE FOR ORDER BY'):
+                problems.append(detail)
+            elif detail.startswith('SCAN ') and filtered:
+                if 'VIRTUAL TABLE' in detail or 'SUBQUERY' in detail.upper():
+                    continue
+                if 'USING' not in detail or not limited:
+                    problems.append(detail)
+        return problems
+
+    @staticmethod
+    def plan_shape(query: str) -> str:
+        return _SELECT_LIST.sub('SELECT ... FROM ', normalize_query(query))
+
+    def check(self, query: str, parameters: List[Any] = None) -> List[str]:
+        if not self.enabled:
+            return []
+
+        # Plans depend on the query shape, not on the bound values, the
+        # LIMIT/OFFSET literals or the projected columns.
+        shape = self.plan_shape(query)
+        with self._lock:
+            if shape in self._checked:
+                problems = self._checked[shape]
+                self._checked.move_to_end(shape)
+            else:
+                problems = None
+
+        if problems is None:
+            problems = self.find_problems(self.explain(query, parameters), query)
+            with self._lock:
+                self._checked[shape] = problems
+                while len(self._checked) > self.max_tracked:
+                    self._checked.popitem(last=False)
+
+            for problem in problems:
+                logger.warning(f"Query plan problem '{problem}' in: {query}")
+
+        if problems and self.mode == 'raise':
+            raise QueryPlanError(f"Query plan problems {problems} in: {query}")
+
+        return problems
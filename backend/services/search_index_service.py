@@ -0,0 +1,80 @@
+import logging
+from typing import List
+
+from services.database_service import DatabaseService
+
+logger = logging.getLogger(__name__)
+
+
+FTS_TABLE = 'book_fts'
+FTS_COLUMNS = ['title', 'author', 'synopsis', 'overview', 'excerpt', 'subjects']
+
+
+class SearchIndexService:
+    def __init__(self, db_service: DatabaseService):
+        self.db_service = db_service
+
+    def is_available(self) -> bool:
+        try:
+            return self.db_service.table_exists(FTS_TABLE)
+        except Exception as e:
+            logger.warning(f"Could not check full-text index: {e}")
+            return False
+
+    def _schema_statements(self) -> List[str]:
+        columns = ', '.join(FTS_COLUMNS)
+        new_values = ', '.join(f"new.{column}" for column in FTS_COLUMNS)
+        old_values = ', '.join(f"old.{column}" for column in FTS_COLUMNS)
+
+        return [
+            f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+                {columns},
+                content='book',
+                content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2',
+                prefix='2 3'
+            )
+            """,
+            f"""
+            CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON book BEGIN
+                INSERT INTO {FTS_TABLE}(rowid, {columns}) VALUES (new.id, {new_values});
+            END
+            """,
+            f"""
+            CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON book BEGIN
+                INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {columns}) VALUES ('delete', old.id, {old_values});
+            END
+            """,
+            f"""
+            CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE ON book BEGIN
+                INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {columns}) VALUES ('delete', old.id, {old_values});
+                INSERT INTO {FTS_TABLE}(rowid, {columns}) VALUES (new.id, {new_values});
+            END
+            """
+        ]
+
+    def create(self) -> None:
+        with self.db_service.transaction() as conn:
+            for statement in self._schema_statements():
+                conn.execute(statement)
+        logger.info("Full-text index %s created", FTS_TABLE)
+
+    def rebuild(self) -> int:
+        with self.db_service.transaction() as conn:
+            conn.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+            indexed = conn.execute("SELECT COUNT(*) FROM book").fetchone()[0]
+        logger.info("Full-text index %s rebuilt: %s books", FTS_TABLE, indexed)
+        return indexed
+
+    def optimize(self) -> None:
+        with self.db_service.transaction() as conn:
+            conn.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')")
+        logger.info("Full-text index %s optimized", FTS_TABLE)
+
+    def drop(self) -> None:
+        with self.db_service.transaction() as conn:
+            for suffix in ('ai', 'ad', 'au'):
+                conn.execute(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}")
+            conn.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+        logger.info("Full-text index %s dropped", FTS_TABLE)
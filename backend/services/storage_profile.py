@@ -0,0 +1,53 @@
+import sqlite3
+from dataclasses import dataclass
+from typing import List, Optional
+
+
+@dataclass
+class StorageProfile:
+    journal_mode: Optional[str] = 'WAL'
+    synchronous: Optional[str] = 'NORMAL'
+    cache_size: Optional[int] = -16000
+    mmap_size: Optional[int] = 268435456
+    temp_store: Optional[str] = 'MEMORY'
+    busy_timeout: Optional[int] = 5000
+
+    def pragmas(self) -> List[str]:
+        statements = []
+        if self.busy_timeout is not None:
+            statements.append(f"PRAGMA busy_timeout = {int(self.busy_timeout)}")
+        if self.journal_mode:
+            statements.append(f"PRAGMA journal_mode = {self._keyword(self.journal_mode)}")
+        if self.synchronous:
+            statements.append(f"PRAGMA synchronous = {self._keyword(self.synchronous)}")
+        if self.cache_size is not None:
+            statements.append(f"PRAGMA cache_size = {int(self.cache_size)}")
+        if self.mmap_size is not None:
+            statements.append(f"PRAGMA mmap_size = {int(self.mmap_size)}")
+        if self.temp_store:
+            statements.append(f"PRAGMA temp_store = {self._keyword(self.temp_store)}")
+        return statements
+
+    def apply(self, conn: sqlite3.Connection, read_only: bool = False) -> None:
+        for statement in self.pragmas():
+            conn.execute(statement)
+        if read_only:
+            conn.execute("PRAGMA query_only = ON")
+
+    @staticmethod
+    def _keyword(value: str) -> str:
+        keyword = str(value).strip().upper()
+        if not keyword.isalnum():
+            raise ValueError(f"Invalid PRAGMA value: {value}")
+        return keyword
+
+    @classmethod
+    def from_config(cls, config) -> 'StorageProfile':
+        return cls(
+            journal_mode=config.SQLITE_JOURNAL_MODE,
+            synchronous=config.SQLITE_SYNCHRONOUS,
+            cache_size=config.SQLITE_CACHE_SIZE,
+            mmap_size=config.SQLITE_MMAP_SIZE,
+            temp_store=config.SQLITE_TEMP_STORE,
+            busy_timeout=config.SQLITE_BUSY_TIMEOUT
+        )
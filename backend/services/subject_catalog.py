@@ -0,0 +1,131 @@
+import logging
+from typing import Any, Dict, List, Optional
+
+from services.database_service import DatabaseService
+
+logger = logging.getLogger(__name__)
+
+
+SUBJECT_TABLE = 'book_subject'
+
+
+class SubjectCatalog:
+    def __init__(self, db_service: DatabaseService):
+        self.db_service = db_service
+
+    @staticmethod
+    def split_subjects(subjects: Optional[str]) -> List[str]:
+        if not subjects or not isinstance(subjects, str):
+            return []
+
+        seen = set()
+        result = []
+        for subject in subjects.split(','):
+            cleaned = subject.strip()
+            if cleaned and cleaned.lower() not in seen:
+                seen.add(cleaned.lower())
+                result.append(cleaned)
+        return result
+
+    def is_available(self) -> bool:
+        try:
+            return self.db_service.table_exists(SUBJECT_TABLE)
+        except Exception as e:
+            logger.warning(f"Could not check subject catalog: {e}")
+            return False
+
+    @staticmethod
+    def _split_select(column: str) -> str:
+        # Splits the comma-separated column in SQL so the triggers work for
+        # any writer, including ones that never load this module.
+        # INSERT OR IGNORE plus the NOCASE key keeps the first spelling of a
+        # repeated subject, matching split_subjects().
+        return f"""
+            SELECT trim(value) AS subject FROM (
+                WITH RECURSIVE parts(value, rest) AS (
+                    SELECT '', {column} || ','
+                    UNION ALL
+                    SELECT substr(rest, 1, instr(rest, ',') - 1), substr(rest, instr(rest, ',') + 1)
+                    FROM parts WHERE rest != ''
+                )
+                SELECT value FROM parts
+            ) WHERE trim(value) != ''
+        """
+
+    def _schema_statements(self) -> List[str]:
+        return [
+            f"""
+            CREATE TABLE IF NOT EXISTS {SUBJECT_TABLE} (
+                subject TEXT NOT NULL COLLATE NOCASE,
+                book_id INTEGER NOT NULL,
+                PRIMARY KEY (subject, book_id)
+            ) WITHOUT ROWID
+            """,
+            f"CREATE INDEX IF NOT EXISTS idx_{SUBJECT_TABLE}_book_id ON {SUBJECT_TABLE} (book_id)",
+            f"""
+            CREATE TRIGGER IF NOT EXISTS {SUBJECT_TABLE}_ai AFTER INSERT ON book BEGIN
+                INSERT OR IGNORE INTO {SUBJECT_TABLE} (subject, book_id)
+                SELECT subject, new.id FROM ({self._split_select('new.subjects')});
+            END
+            """,
+            f"""
+            CREATE TRIGGER IF NOT EXISTS {SUBJECT_TABLE}_ad AFTER DELETE ON book BEGIN
+                DELETE FROM {SUBJECT_TABLE} WHERE book_id = old.id;
+            END
+            """,
+            f"""
+            CREATE TRIGGER IF NOT EXISTS {SUBJECT_TABLE}_au AFTER UPDATE OF id, subjects ON book BEGIN
+                DELETE FROM {SUBJECT_TABLE} WHERE book_id = old.id;
+                INSERT OR IGNORE INTO {SUBJECT_TABLE} (subject, book_id)
+                SELECT subject, new.id FROM ({self._split_select('new.subjects')});
+            END
+            """
+        ]
+
+    def create(self) -> None:
+        with self.db_service.transaction() as conn:
+            for statement in self._schema_statements():
+                conn.execute(statement)
+        logger.info("Subject catalog %s created", SUBJECT_TABLE)
+
+    def rebuild(self, batch_size: int = 1000) -> int:
+        with self.db_service.transaction() as conn:
+            conn.execute(f"DELETE FROM {SUBJECT_TABLE}")
+            cursor = conn.execute("SELECT id, subjects FROM book WHERE subjects IS NOT NULL AND subjects != ''")
+
+            rows_written = 0
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                pairs = [
+                    (subject, row[0])
+                    for row in rows
+                    for subject in self.split_subjects(row[1])
+                ]
+                conn.executemany(
+                    f"INSERT OR IGNORE INTO {SUBJECT_TABLE} (subject, book_id) VALUES (?, ?)", pairs
+                )
+                rows_written += len(pairs)
+
+        logger.info("Subject catalog %s rebuilt: %s entries", SUBJECT_TABLE, rows_written)
+        return rows_written
+
+    def drop(self) -> None:
+        with self.db_service.transaction() as conn:
+            for suffix in ('ai', 'ad', 'au'):
+                conn.execute(f"DROP TRIGGER IF EXISTS {SUBJECT_TABLE}_{suffix}")
+            conn.execute(f"DROP TABLE IF EXISTS {SUBJECT_TABLE}")
+        logger.info("Subject catalog %s dropped", SUBJECT_TABLE)
+
+    def list_subjects(self) -> List[str]:
+        results = self.db_service.execute_query(
+            f"SELECT subject FROM {SUBJECT_TABLE} GROUP BY subject ORDER BY subject"
+        )
+        return [row[0] for row in results]
+
+    def subject_counts(self) -> List[Dict[str, Any]]:
+        results = self.db_service.execute_query(
+            f"SELECT subject, COUNT(*) FROM {SUBJECT_TABLE} GROUP BY subject ORDER BY subject"
+        )
+        return [{'subject': row[0], 'book_count': row[1]} for row in results]
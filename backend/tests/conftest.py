@@ -0,0 +1,36 @@
+import pytest
+
+from benchmarks.catalog import CatalogGenerator, prepare_catalog
+from services.book_service import BookService
+from services.database_service import DatabaseService
+from services.schema_service import QueryPlanGuard
+
+
+@pytest.fixture(scope='session')
+def catalog_path(tmp_path_factory):
+    # Generated once per session; tests that write take a copy of it.
+    path = str(tmp_path_factory.mktemp('catalog') / 'catalog.sqlite')
+    CatalogGenerator(books=300, seed=7).write(path)
+    prepare_catalog(path)
+    return path
+
+
+@pytest.fixture
+def db_service(catalog_path, tmp_path):
+    path = str(tmp_path / 'books.sqlite')
+    with open(catalog_path, 'rb') as source, open(path, 'wb') as target:
+        target.write(source.read())
+
+    db_service = DatabaseService(db_path=path)
+    yield db_service
+    db_service.close()
+
+
+@pytest.fixture
+def query_plan_guard(db_service):
+    return QueryPlanGuard(db_service, mode='raise')
+
+
+@pytest.fixture
+def book_service(db_service, query_plan_guard):
+    return BookService(db_service=db_service, query_plan_guard=query_plan_guard)
@@ -0,0 +1,52 @@
+def test_oversized_int_is_a_per_item_error(book_service):
+    result = book_service.bulk_upsert_books([
+        {'title': 'Before', 'author': 'A'},
+        {'title': 'Huge', 'author': 'A', 'isbn13': 2 ** 70},
+        {'title': 'After', 'author': 'A', 'pages': -2 ** 64}
+    ])
+
+    statuses = [item['status'] for item in result['results']]
+    assert statuses == ['inserted', 'error', 'error']
+    assert 'out of range' in result['results'][1]['error']
+    assert result['stats']['inserted'] == 1
+    assert result['stats']['failed'] == 2
+
+
+def test_nested_values_do_not_fail_the_batch(book_service):
+    result = book_service.bulk_upsert_books([
+        {'title': 'First', 'author': 'A'},
+        {'title': {'nested': True}, 'author': 'A'},
+        {'title': 'Third', 'author': ['A', 'B']},
+        {'title': 'Fourth', 'author': 'A'}
+    ])
+
+    statuses = [item['status'] for item in result['results']]
+    assert statuses == ['inserted', 'error', 'error', 'inserted']
+    assert result['results'][1]['error'] == "title must be a string, number or null"
+
+    inserted = [item['id'] for item in result['results'] if item['status'] == 'inserted']
+    assert [book_service.get_book_by_id(book_id)['title'] for book_id in inserted] == ['First', 'Fourth']
+
+
+def test_rejected_row_is_rolled_back_alone(book_service, db_service):
+    # A constraint added for the test stands in for any row SQLite refuses.
+    with db_service.transaction() as conn:
+        conn.execute(
+            "CREATE TRIGGER reject_title BEFORE INSERT ON book WHEN new.title = 'Rejected' "
+            "BEGIN SELECT RAISE(ABORT, 'rejected'); END"
+        )
+
+    result = book_service.bulk_upsert_books([
+        {'title': 'Kept', 'author': 'A'},
+        {'title': 'Rejected', 'author': 'A'},
+        {'title': 'Also kept', 'author': 'A'}
+    ])
+
+    assert [item['status'] for item in result['results']] == ['inserted', 'error', 'inserted']
+    inserted = [item['id'] for item in result['results'] if item['status'] == 'inserted']
+    assert inserted[1] == inserted[0] + 1
+
+    rows = db_service.execute_query(
+        f"SELECT title FROM book WHERE id IN ({', '.join('?' * len(inserted))}) ORDER BY id", inserted
+    )
+    assert [row[0] for row in rows] == ['Kept', 'Also kept']
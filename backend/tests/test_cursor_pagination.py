@@ -0,0 +1,45 @@
+import pytest
+
+from services.cursor_pagination import keyset_segments
+
+
+@pytest.fixture
+def null_titles(db_service):
+    with db_service.transaction() as conn:
+        conn.execute("UPDATE book SET title = NULL WHERE id % 7 = 0")
+
+
+def walk(book_service, **kwargs):
+    ids = []
+    cursor = None
+    while True:
+        page = book_service.get_books_with_filters(page_size=8, cursor=cursor, fields='id', **kwargs)
+        ids.extend(book['id'] for book in page['books'])
+        cursor = page['pagination']['next_cursor']
+        if cursor is None:
+            return ids
+
+
+@pytest.mark.parametrize('direction', ['ASC', 'DESC'])
+@pytest.mark.parametrize('value', ['M', None])
+def test_keyset_segments_seek_the_index(query_plan_guard, null_titles, direction, value):
+    for condition, parameters in keyset_segments('title', direction, value, 150):
+        query = (
+            f"SELECT * FROM book WHERE {condition} "
+            f"ORDER BY title {direction}, id {direction} LIMIT 9"
+        )
+        plan = query_plan_guard.explain(query, parameters)
+
+        assert len(plan) == 1, plan
+        assert plan[0].startswith('SEARCH book USING INDEX idx_book_title'), plan
+
+
+@pytest.mark.parametrize('direction', ['ASC', 'DESC'])
+def test_cursor_walk_crosses_null_keys(book_service, db_service, null_titles, direction):
+    expected = [
+        row[0] for row in db_service.execute_query(
+            f"SELECT id FROM book ORDER BY title {direction}, id {direction}"
+        )
+    ]
+
+    assert walk(book_service, order_by='title', order_direction=direction) == expected
@@ -0,0 +1,51 @@
+import math
+
+import pytest
+from flask import Flask
+
+from core.json_provider import FastJSONProvider
+
+pytest.importorskip('orjson')
+
+# The second document is not ASCII, which sends orjson's output back
+# through the stdlib encoder as well.
+DOCUMENTS = [
+    {
+        'nan': math.nan,
+        'values': [math.inf, -math.inf, 1.5, 0.0, None],
+        'nested': {'pages': math.nan, 'title': 'Title', 'count': 3},
+        'pair': (math.inf, 'x')
+    },
+    {'pages': math.nan, 'title': 'Título'}
+]
+
+
+@pytest.fixture
+def app():
+    return Flask(__name__)
+
+
+@pytest.fixture
+def providers(app):
+    return {encoder: FastJSONProvider(app, encoder=encoder) for encoder in ('orjson', 'stdlib')}
+
+
+@pytest.mark.parametrize('document', DOCUMENTS)
+@pytest.mark.parametrize('kwargs', [{'separators': (',', ':')}, {'indent': 2}])
+def test_providers_encode_non_finite_floats_alike(providers, document, kwargs):
+    encoded = {encoder: provider.dumps(document, **kwargs) for encoder, provider in providers.items()}
+
+    assert encoded['stdlib'] == encoded['orjson']
+    assert 'NaN' not in encoded['stdlib'] and 'Infinity' not in encoded['stdlib']
+
+
+@pytest.mark.parametrize('document', DOCUMENTS)
+@pytest.mark.parametrize('compact', [True, False])
+def test_provider_responses_match(app, providers, document, compact):
+    bodies = {}
+    for encoder, provider in providers.items():
+        provider.compact = compact
+        with app.app_context():
+            bodies[encoder] = provider.response(document).get_data()
+
+    assert bodies['stdlib'] == bodies['orjson']
@@ -0,0 +1,40 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from services.book_service import BookService
+
+
+@pytest.fixture
+def services(db_service, query_plan_guard):
+    executor = ThreadPoolExecutor(max_workers=2)
+    # A cap below the catalog size makes unfiltered estimated counts stop
+    # early, while the filtered listing stays under it.
+    yield {
+        mode: BookService(
+            db_service=db_service,
+            query_plan_guard=query_plan_guard,
+            count_estimate_cap=120,
+            list_query_mode=mode,
+            query_executor=executor
+        )
+        for mode in BookService.LIST_QUERY_MODES
+    }
+    executor.shutdown(wait=True)
+
+
+@pytest.mark.parametrize('count_mode', BookService.COUNT_MODES)
+@pytest.mark.parametrize('filters', [{}, {'format': 'Hardcover'}])
+@pytest.mark.parametrize('page', [1, 4, 100])
+def test_modes_return_identical_metadata(services, count_mode, filters, page):
+    responses = {
+        mode: service.get_books_with_filters(
+            filters=dict(filters), page=page, page_size=10, order_by='title', count_mode=count_mode, fields='id'
+        )
+        for mode, service in services.items()
+    }
+
+    sequential = responses['sequential']
+    for mode, response in responses.items():
+        assert response['pagination'] == sequential['pagination'], mode
+        assert response['books'] == sequential['books'], mode
@@ -0,0 +1,66 @@
+import pytest
+
+from services.schema_service import REQUIRED_INDEXES
+
+# Columns a book index leads with; sorting on any other column reads the
+# whole table by design and is what the guard exists to report.
+SORTABLE_COLUMNS = sorted({index.columns[0] for index in REQUIRED_INDEXES if index.table == 'book'})
+
+
+@pytest.fixture
+def null_keys(db_service):
+    # NULL sort keys send cursor pages across both keyset segments.
+    with db_service.transaction() as conn:
+        conn.execute("UPDATE book SET title = NULL, pubdate = NULL, pages = NULL WHERE id % 11 = 0")
+
+
+def pages(book_service, cursor_key, cursor=None, **kwargs):
+    while True:
+        page = book_service.get_books_with_filters(page_size=7, cursor=cursor, fields='id', **kwargs)
+        yield page
+        cursor = page['pagination'][cursor_key]
+        if cursor is None:
+            return
+
+
+@pytest.mark.parametrize('direction', ['ASC', 'DESC'])
+@pytest.mark.parametrize('column', SORTABLE_COLUMNS)
+def test_cursor_walk_passes_the_guard(book_service, db_service, null_keys, column, direction):
+    expected = [
+        row[0] for row in db_service.execute_query(
+            f"SELECT id FROM book ORDER BY {column} {direction}, id {direction}"
+        )
+    ]
+
+    forward = list(pages(book_service, 'next_cursor', order_by=column, order_direction=direction))
+    assert [book['id'] for page in forward for book in page['books']] == expected
+
+    backward = list(pages(
+        book_service, 'prev_cursor', cursor=forward[-1]['pagination']['prev_cursor'],
+        order_by=column, order_direction=direction
+    ))
+    walked_back = [book['id'] for page in reversed(backward) for book in page['books']]
+    assert walked_back + [book['id'] for book in forward[-1]['books']] == expected
+
+
+@pytest.mark.parametrize('direction', ['ASC', 'DESC'])
+@pytest.mark.parametrize('column', ['title', 'pubdate'])
+def test_filtered_cursor_walk_passes_the_guard(book_service, db_service, null_keys, column, direction):
+    expected = [
+        row[0] for row in db_service.execute_query(
+            f"SELECT id FROM book WHERE format = ? ORDER BY {column} {direction}, id {direction}", ['Paperback']
+        )
+    ]
+
+    forward = pages(
+        book_service, 'next_cursor', filters={'format': 'Paperback'}, order_by=column, order_direction=direction
+    )
+    assert [book['id'] for page in forward for book in page['books']] == expected
+
+
+def test_capped_count_passes_the_guard(book_service):
+    book_service.count_estimate_cap = 20
+    page = book_service.get_books_with_filters(filters={'format': 'Hardcover'}, count_mode='estimated')
+
+    assert page['pagination']['total_count'] == 20
+    assert page['pagination']['total_count_exact'] is False